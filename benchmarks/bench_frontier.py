@@ -0,0 +1,58 @@
+"""Microbenchmark of the crawl frontier.
+
+Compares the former sorted list, which was filled by ``bisect.insort`` and
+drained by ``pop(0)``, with ``Frontier`` for a growing number of urls.
+
+    python benchmarks/bench_frontier.py
+"""
+import bisect
+import time
+
+from website_checker.crawl.frontier import DEPTH, FIFO, Frontier
+
+SIZES = [10_000, 100_000, 1_000_000, 2_000_000]
+SORTED_LIST_MAX_SIZE = 100_000  # grows quadratic, larger sizes take minutes
+
+
+def make_urls(count):
+    return [f"https://domain.test/section-{idx % 97}/page-{idx}" for idx in range(count)]
+
+
+def bench_sorted_list(urls):
+    links: list = []
+    for url in urls:
+        index = bisect.bisect_left(links, url)
+        if index == len(links) or links[index] != url:
+            links.insert(index, url)
+    while links:
+        links.pop(0)
+
+
+def bench_frontier(urls, order):
+    frontier = Frontier(order)
+    for url in urls:
+        frontier.push(url)
+        url in frontier
+    while frontier:
+        frontier.pop()
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'urls':>10} {'sorted list':>12} {'fifo':>8} {'depth':>8}  (seconds)")
+    for size in SIZES:
+        urls = make_urls(size)
+        sorted_list = measure(bench_sorted_list, urls[:SORTED_LIST_MAX_SIZE]) if size <= SORTED_LIST_MAX_SIZE else None
+        fifo = measure(bench_frontier, urls, FIFO)
+        depth = measure(bench_frontier, urls, DEPTH)
+        sorted_list_text = f"{sorted_list:12.2f}" if sorted_list is not None else f"{'-':>12}"
+        print(f"{size:>10} {sorted_list_text} {fifo:8.2f} {depth:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark of the HTML checks of a single page.
+
+Compares a separate parse per check, like the checks did before, with one
+parsed document shared by all checks, for each available parser. Both walk the
+tree once per check, although the checks stream by now. Single pass dispatches
+the elements of one traversal to all checks, streamed tokenizes the HTML
+without building a tree. Early exit puts an invalid heading first.
+
+    python benchmarks/bench_html_parse.py
+"""
+import time
+
+from bs4 import BeautifulSoup
+
+from website_checker.analyze.visitor import stream, traverse
+from website_checker.check.detect_page_builder import DetectCMSPageBuilder
+from website_checker.check.heading_structure import CheckHeadingStructure
+from website_checker.check.semantic_html import CheckSemanticHtml
+from website_checker.crawl import websitepage
+from website_checker.crawl.websitepage import WebsitePage
+
+CHECKS = [CheckHeadingStructure, CheckSemanticHtml, DetectCMSPageBuilder]
+SECTIONS = [10, 100, 1000]
+REPEAT = 5
+
+
+def make_html(sections, first_heading="h1"):
+    items = "<li>item</li>" * 10
+    body = "".join(
+        f'<section class="elementor-section"><h2>Section {idx}</h2>'
+        f'<div class="elementor-widget"><p>Text <a href="/page-{idx}">link</a> <img src="/img-{idx}.png"></p>'
+        f'<ul>{items}</ul></div></section>'
+        for idx in range(sections)
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+        '<meta name="generator" content="WordPress 6.2"><title>Benchmark</title></head>'
+        f'<body><header><nav>Menu</nav></header><main><{first_heading}>Benchmark</{first_heading}>'
+        f'{body}</main><footer></footer></body></html>'
+    )
+
+
+def parsers():
+    available = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+
+        available.append("lxml")
+    except ImportError:
+        pass
+    return available
+
+
+def check_tree(check, page):
+    """Runs a check on the parsed tree of a page, like before checks streamed."""
+    traverse(page, [check])
+    return check.finish(page)
+
+
+def run_checks_separately(html):
+    for check in CHECKS:
+        check_tree(check(), WebsitePage(html=html))  # every page parses the html again
+
+
+def run_checks_shared(html):
+    page = WebsitePage(html=html)
+    for check in CHECKS:
+        check_tree(check(), page)
+
+
+def run_checks_single_pass(html):
+    page = WebsitePage(html=html)
+    checks = [check() for check in CHECKS]
+    traverse(page, checks)
+    for check in checks:
+        check.finish(page)
+
+
+def run_checks_streamed(html):
+    page = WebsitePage(html=html)
+    checks = [check() for check in CHECKS]
+    stream(page, checks)
+    for check in checks:
+        check.finish(page)
+
+
+def run_heading_check_streamed(html):
+    CheckHeadingStructure().check(WebsitePage(html=html))
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    print(
+        f"{'sections':>8} {'KiB':>6} {'parser':>12} {'per check':>10} {'shared':>8} {'single pass':>12}"
+        f" {'streamed':>9} {'early exit':>11}  (ms per page)"
+    )
+    for sections in SECTIONS:
+        html = make_html(sections)
+        for parser in parsers():
+            websitepage.HTML_PARSER = parser
+            BeautifulSoup(html, parser)  # warm up
+            separately = measure(run_checks_separately, html) * 1000
+            shared = measure(run_checks_shared, html) * 1000
+            single_pass = measure(run_checks_single_pass, html) * 1000
+            streamed = measure(run_checks_streamed, html) * 1000
+            early_exit = measure(run_heading_check_streamed, make_html(sections, first_heading="h2")) * 1000
+            print(
+                f"{sections:>8} {len(html) // 1024:>6} {parser:>12} {separately:10.1f} {shared:8.1f}"
+                f" {single_pass:12.1f} {streamed:9.1f} {early_exit:11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark of the memory used to build the template context of a report.
+
+Compares the former deep copy and ``dataclasses.asdict`` of the report data
+with the view returned by ``ReportData.to_dict``. Peak memory is traced while
+building the context and rendering the HTML, relative to the report data.
+
+    python benchmarks/bench_report_memory.py
+"""
+import copy
+import tracemalloc
+from dataclasses import asdict
+
+from website_checker.analyze.result import PageEvaluation, Result, Status, adapter
+from website_checker.report import utilities
+from website_checker.report.report import DEFAULT_TEMPLATE
+
+PAGES = [10, 100, 500]
+SCREENSHOT_SIZE = 200 * 1024  # bytes per page
+ENTRIES = 50  # per result
+
+
+def make_report_data(count):
+    pages = []
+    for idx in range(count):
+        page = PageEvaluation(
+            url=f"https://domain.test/page-{idx}", title=f"Page {idx}", screenshot=bytes(SCREENSHOT_SIZE)
+        )
+        entries = [[f"cookie-{idx}-{entry}", "Analytics", "1 year"] for entry in range(ENTRIES)]
+        page.add_result(
+            Result(
+                title="Cookies",
+                description="Finds cookies.",
+                result={"table": {"heading": ["Name", "Category", "Retention"], "entries": entries}},
+                status=Status.WARNING,
+            )
+        )
+        pages.append(page)
+    return adapter(pages)
+
+
+class CopiedReportData:
+    """The former context, which copies the report data twice."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def to_dict(self):
+        cp = copy.deepcopy(self.data)
+        cp.creation_date = self.data.creation_date.strftime("%d.%m.%Y %H:%M")
+        return {k: v for k, v in asdict(cp).items() if v}
+
+
+def traced_report_data(count):
+    """Returns report data and the memory it takes."""
+    tracemalloc.start()
+    data = make_report_data(count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def peak(func):
+    tracemalloc.start()
+    func()
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def main():
+    print(
+        f"{'pages':>6} {'data MiB':>9} {'copied':>8} {'view':>8} {'render copied':>14} {'render view':>12}  (peak /"
+        " data)"
+    )
+    for count in PAGES:
+        data, size = traced_report_data(count)
+        copied = peak(lambda: CopiedReportData(data).to_dict())
+        view = peak(lambda: dict(data.to_dict()))
+        render_copied = peak(lambda: utilities.build_html(DEFAULT_TEMPLATE, CopiedReportData(data)))
+        render_view = peak(lambda: utilities.build_html(DEFAULT_TEMPLATE, data))
+        print(
+            f"{count:>6} {size / 2**20:9.1f} {copied / size:8.2f} {view / size:8.2f}"
+            f" {render_copied / size:14.2f} {render_view / size:12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark of the CLI startup.
+
+Measures the wall time of ``websiteanalyzer -h`` and lists the slowest
+imports of ``website_checker.cli`` reported by ``python -X importtime``.
+Fails when the help takes longer than the budget.
+
+    python benchmarks/bench_startup.py
+"""
+import subprocess
+import sys
+import time
+
+REPEAT = 5
+BUDGET = 0.5  # seconds for the help
+TOP = 10
+
+
+def measure_help():
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "website_checker", "-h"], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def slowest_imports():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import website_checker.cli"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        imports.append((int(cumulative), module.rstrip()))
+    return sorted(imports, reverse=True)[:TOP]
+
+
+def main():
+    print(f"{'cumulative ms':>13}  module")
+    for cumulative, module in slowest_imports():
+        print(f"{cumulative / 1000:13.1f}  {module}")
+
+    help_time = measure_help()
+    print(f"\nwebsiteanalyzer -h: {help_time * 1000:.0f} ms (budget {BUDGET * 1000:.0f} ms)")
+    if help_time > BUDGET:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 import abc
+import threading
 from unittest import mock
 
 import pytest
 
-from website_checker.analyze.analyzer import Analyzer
+from website_checker.analyze import analyzer as analyzer_module
+from website_checker.analyze.analyzer import Analyzer, load_checks
 from website_checker.analyze.base_analyzer import BaseAnalyzer
-from website_checker.analyze.result import Status
+from website_checker.analyze.result import Result, Status
+from website_checker.check import CHECKS
+from website_checker.check.heading_structure import CheckHeadingStructure
 
 
 class InvalidClass(metaclass=abc.ABCMeta):
@@ -24,12 +28,109 @@ def test_register_analyzers():
     assert InvalidClass not in analyzer.registry.values()
 
 
+def test_register_shipped_checks():
+    analyzer = Analyzer()
+
+    for reference in CHECKS:
+        assert reference.rpartition(":")[2] in analyzer.registry
+
+
+class PluginBaseCheck(CheckHeadingStructure):
+    """Intermediate base class of a plugin, which is no check itself."""
+
+
+class PluginCheck(PluginBaseCheck):
+    pass
+
+
+def test_load_checks_of_entry_points(caplog):
+    plugin = mock.Mock()
+    plugin.load.return_value = PluginCheck
+    broken_plugin = mock.Mock()
+    broken_plugin.name = "broken"
+    broken_plugin.load.side_effect = ImportError("missing dependency")
+
+    with mock.patch.object(analyzer_module, "_entry_points", return_value=[plugin, broken_plugin]):
+        checks = load_checks()
+
+    plugin.load.assert_called_once()
+    assert checks["PluginCheck"] is PluginCheck
+    assert "PluginBaseCheck" not in checks
+    assert "AnalyzerTest" in checks
+    assert "Check broken not loaded" in caplog.text
+
+
+def test_load_checks_skips_entry_points_without_check(caplog):
+    plugin = mock.Mock()
+    plugin.name = "module"
+    plugin.load.return_value = analyzer_module
+
+    with mock.patch.object(analyzer_module, "_entry_points", return_value=[plugin]):
+        checks = load_checks()
+
+    assert "module" not in checks
+    assert "Check module not loaded" in caplog.text
+
+
+def test_load_checks_skips_indirect_subclasses():
+    checks = load_checks()
+
+    assert "PluginBaseCheck" not in checks
+    assert "PluginCheck" not in checks  # not registered
+    assert list(checks.values()).count(CheckHeadingStructure) == 1
+
+
+def test_reuse_checks(page):
+    analyzer = Analyzer()
+
+    first = analyzer.run_checks(page)
+    checks = analyzer._checks()
+    second = analyzer.run_checks(page)
+
+    assert analyzer._checks() is checks
+    assert second.results == first.results
+    assert second.tags == first.tags
+
+
 def test_run_analyzer(page):
     analyzer = Analyzer()
 
     result = analyzer.run_checks(page)
 
     assert result
+    assert all(type(res) is Result for res in result.results)
+
+
+def test_run_analyzer_in_processes(page):
+    page.screenshot = b"screenshot"
+    page.thumbnail = b"thumbnail"
+    expected = Analyzer().run_checks(page)
+
+    with Analyzer(processes=2) as analyzer:
+        single = analyzer.run_checks(page)
+        many = list(analyzer.run_checks_many([page] * 3))
+
+    for result in [single] + many:
+        assert result.results == expected.results
+        assert result.tags == expected.tags
+        assert result.screenshot == b"screenshot"
+        assert result.thumbnail == b"thumbnail"
+
+
+def test_process_pool_is_spawned_once_on_enter():
+    with mock.patch.object(analyzer_module, "ProcessPoolExecutor") as mock_pool:
+        analyzer = Analyzer(processes=2)
+        with analyzer:
+            mock_pool.assert_called_once()
+            threads = [threading.Thread(target=analyzer._get_pool) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+    mock_pool.assert_called_once()
+    assert mock_pool.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    mock_pool.return_value.shutdown.assert_called_once_with(wait=True)
 
 
 # parametrize
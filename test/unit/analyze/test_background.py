@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from website_checker.analyze.background import BackgroundAnalyzer
+from website_checker.analyze.result import PageEvaluation
+from website_checker.crawl.websitepage import WebsitePage
+
+
+def make_pages(count):
+    return [WebsitePage(url=f"https://domain.test/{idx}", title=f"Page {idx}") for idx in range(count)]
+
+
+def evaluate(page):
+    return PageEvaluation(url=page.url, title=page.title)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_background_analyzer_keeps_order(workers):
+    pages = make_pages(10)
+
+    with BackgroundAnalyzer(evaluate, workers=workers) as background:
+        results = list(background.map(pages))
+
+    assert [page for page, _ in results] == pages
+    assert [evaluation.url for _, evaluation in results] == [page.url for page in pages]
+
+
+def test_background_analyzer_crawls_while_analyzing():
+    crawled = []
+    first_crawled = threading.Event()
+    second_crawled = threading.Event()
+
+    def pages():
+        for page in make_pages(2):
+            crawled.append(page.url)
+            yield page
+            first_crawled.set()
+
+    def slow_evaluate(page):
+        if page.url.endswith("/0"):
+            # the crawl of the next page continues while the first page is analyzed
+            assert first_crawled.wait(timeout=5)
+            second_crawled.set()
+        return evaluate(page)
+
+    with BackgroundAnalyzer(slow_evaluate, workers=1, max_pending=2) as background:
+        results = list(background.map(pages()))
+
+    assert second_crawled.is_set()
+    assert len(results) == 2
+
+
+def test_background_analyzer_limits_pending_pages():
+    release = threading.Event()
+    crawled = []
+
+    def pages():
+        for page in make_pages(10):
+            crawled.append(page)
+            yield page
+
+    def blocking_evaluate(page):
+        release.wait(timeout=5)
+        return evaluate(page)
+
+    with BackgroundAnalyzer(blocking_evaluate, workers=1, max_pending=3) as background:
+        results = background.map(pages())
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        next(results)
+        assert len(crawled) == 3
+        assert len(list(results)) == 9
+        timer.join()
+
+
+def test_background_analyzer_propagates_errors():
+    evaluated = []
+
+    def failing_evaluate(page):
+        if page.url.endswith("/1"):
+            raise RuntimeError("analysis failed")
+        evaluated.append(page.url)
+        return evaluate(page)
+
+    with BackgroundAnalyzer(failing_evaluate, workers=1, max_pending=1) as background:
+        with pytest.raises(RuntimeError):
+            list(background.map(make_pages(5)))
+
+    assert evaluated == ["https://domain.test/0"]
@@ -4,6 +4,7 @@ from website_checker.analyze.result import (
     PageEvaluation,
     Result,
     Status,
+    adapter,
     collect_test_descriptions,
     create_status_summary,
 )
@@ -51,3 +52,20 @@ def test_create_status_summary(mock_eval_pages):
     assert len(res) == expected_pages
     assert res[0].title == "Test Result"
     assert res[0].status == Status.WARNING
+
+
+def test_adapter_uses_first_screenshot(mock_eval_pages):
+    mock_eval_pages[1].screenshot = b"\xff\xd8\xff\xe0"
+
+    report_data = adapter(mock_eval_pages)
+
+    assert report_data.screenshot == "/9j/4A=="
+    assert report_data.screenshot_type == "image/jpeg"
+
+
+def test_adapter_embeds_thumbnails(mock_eval_pages):
+    mock_eval_pages[1].thumbnail = b"\xff\xd8\xff\xe0"
+
+    report_data = adapter(mock_eval_pages)
+
+    assert report_data.thumbnails == {"test2.com": "data:image/jpeg;base64,/9j/4A=="}
@@ -0,0 +1,105 @@
+from html.parser import HTMLParser
+from unittest.mock import patch
+
+import pytest
+
+from website_checker.analyze import visitor as visitor_module
+from website_checker.analyze.visitor import VisitorAnalyzer, stream, traverse
+from website_checker.check.heading_structure import CheckHeadingStructure
+from website_checker.check.semantic_html import CheckSemanticHtml
+from website_checker.crawl import websitepage
+from website_checker.crawl.websitepage import WebsitePage
+
+HTML = (
+    '<html><head><meta name="generator" content="Test"></head>'
+    '<body><h1 id="top">Title</h1><div class="fl-row other">Row</div>'
+    '<div class="other fl-row">Other</div><a href="/" id="link">Link</a><h2>Sub</h2></body></html>'
+)
+
+
+class RecordingVisitor(VisitorAnalyzer):
+    def __init__(self, tags=(), attributes=(), class_prefixes=(), stop_after=None, text=False):
+        super().__init__(hidden=True)
+        self.visit_tags = tags
+        self.visit_attributes = attributes
+        self.visit_class_prefixes = class_prefixes
+        self.visit_text = text
+        self.stop_after = stop_after
+
+    def start(self, page):
+        self.visited = []
+        self.texts = []
+
+    def visit(self, element):
+        self.visited.append(element.name)
+        self.texts.append(element.text)
+        return len(self.visited) == self.stop_after
+
+    def finish(self, page):
+        return self
+
+
+@pytest.mark.parametrize("walk", [traverse, stream])
+def test_traverse_dispatches_elements(walk):
+    page = WebsitePage(html=HTML)
+    headings = RecordingVisitor(tags=("h1", "h2"))
+    with_id = RecordingVisitor(attributes=("id",))
+    builder = RecordingVisitor(class_prefixes=("fl-",))
+    overlapping = RecordingVisitor(tags=("h1",), attributes=("id",))
+
+    walk(page, [headings, with_id, builder, overlapping])
+
+    assert headings.visited == ["h1", "h2"]
+    assert with_id.visited == ["h1", "a"]
+    assert builder.visited == ["div"]  # like [class^='fl-']
+    assert overlapping.visited == ["h1", "a"]
+
+
+@pytest.mark.parametrize("walk", [traverse, stream])
+def test_traverse_stops_early(walk):
+    page = WebsitePage(html=HTML)
+    first_heading = RecordingVisitor(tags=("h1", "h2"), stop_after=1)
+    all_headings = RecordingVisitor(tags=("h1", "h2"))
+
+    walk(page, [first_heading, all_headings])
+
+    assert first_heading.visited == ["h1"]
+    assert all_headings.visited == ["h1", "h2"]
+
+
+def test_visitor_check_runs_alone():
+    visitor = RecordingVisitor(tags=("meta",))
+
+    result = visitor.check(WebsitePage(html=HTML))
+
+    assert result is visitor
+    assert visitor.visited == ["meta"]
+
+
+def test_stream_reads_text_in_document_order():
+    page = WebsitePage(html="<h1>Title <b>&amp; more</b></h1><section><h2>Sub</h2><img></section><h3>Open")
+    headings = RecordingVisitor(tags=("h1", "h2", "h3"), text=True)
+    elements = RecordingVisitor(tags=("section", "img"))
+
+    stream(page, [headings, elements])
+
+    assert headings.visited == ["h1", "h2", "h3"]
+    assert headings.texts == ["Title & more", "Sub", "Open"]
+    assert elements.visited == ["section", "img"]
+
+
+def test_stream_builds_no_tree(page):
+    with patch.object(websitepage, "BeautifulSoup") as mock_soup:
+        CheckHeadingStructure().check(page)
+        CheckSemanticHtml().check(page)
+
+    mock_soup.assert_not_called()
+
+
+def test_stream_stops_tokenizing_early():
+    page = WebsitePage(html="<h2>Invalid first heading</h2>" + "<h1>Heading</h1>" * 1000)
+
+    with patch.object(visitor_module._StreamParser, "feed", autospec=True, side_effect=HTMLParser.feed) as mock_feed:
+        stream(page, [CheckHeadingStructure()], chunk_size=100)
+
+    assert mock_feed.call_count == 1
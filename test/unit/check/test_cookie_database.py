@@ -1,3 +1,8 @@
+import os
+from collections.abc import Mapping
+from unittest import mock
+
+import pandas as pd
 import pytest
 
 from website_checker.check.cookies_data import cookie_database
@@ -48,10 +53,41 @@ def test_load_cookie_database(database_csv):
     with cookie_database.CookieDatabase(database_csv) as cookie_db:
         res = cookie_db.data
 
-    assert type(res) == dict
+    assert isinstance(res, Mapping)
     assert len(res) == len(COOKIE_CSV_EXAMPLE) - 1
 
 
+def test_load_cookie_database_once(database_csv):
+    with mock.patch.object(pd, "read_csv", wraps=pd.read_csv) as mock_read:
+        for _ in range(3):
+            with cookie_database.CookieDatabase(database_csv) as cookie_db:
+                cookie_db.search("CookieConsentBulkTicket")
+
+    assert mock_read.call_count == 1
+
+
+def test_reload_changed_cookie_database(database_csv):
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        assert len(cookie_db.data) == len(COOKIE_CSV_EXAMPLE) - 1
+
+    with open(database_csv, "w") as f:
+        f.write("\n".join(COOKIE_CSV_EXAMPLE[:2]))
+    stat = os.stat(database_csv)
+    os.utime(database_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        assert len(cookie_db.data) == 1
+
+
+def test_search_does_not_change_database(database_csv):
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        res = cookie_db.search("_gat_1234")
+        res["category"] = "Functional"
+
+        assert cookie_db.data["_gat_"]["cookie_name"] == "_gat_"
+        assert cookie_db.search("_gat_5678")["category"] == "Analytics"
+
+
 def test_search_cookie_database(database_csv):
     cookie_name = "CookieConsentBulkTicket"
     with cookie_database.CookieDatabase(database_csv) as cookie_db:
@@ -92,3 +128,73 @@ def test_search_invalid_exact_wildcard_match(database_csv):
     with cookie_database.CookieDatabase(database_csv) as cookie_db:
         with pytest.raises(KeyError):
             cookie_db.search(cookie_name)
+
+
+def test_search_many(database_csv):
+    cookie_names = ["CookieConsentBulkTicket", "_gat_1234", "invalid_name", "_gat_"]
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        res = cookie_db.search_many(cookie_names)
+
+    assert list(res) == ["CookieConsentBulkTicket", "_gat_1234"]
+    assert res["_gat_1234"]["cookie_name"] == "_gat_1234"
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("_gat_gtag_UA_1", "_gat_gtag_"),
+        ("_gat_1", "_gat_"),
+        ("_gat_", "_gat_"),
+        ("_ga", None),
+        ("", None),
+    ],
+)
+def test_prefix_index(name, expected):
+    index = cookie_database.PrefixIndex(["_gat_", "_gat_gtag_", "wp-settings-"])
+
+    assert index.longest_prefix(name) == expected
+
+
+def test_prefix_index_matches_linear_search():
+    with cookie_database.CookieDatabase() as cookie_db:
+        wildcards = [name for name, details in cookie_db.data.items() if cookie_database.is_wildcard(details)]
+        names = [name + "suffix" for name in cookie_db.data] + [name[:-1] for name in cookie_db.data]
+
+        for name in names:
+            prefixes = [wildcard for wildcard in wildcards if name.startswith(wildcard)]
+            expected = max(prefixes, key=len) if prefixes else None
+            assert cookie_db.wildcards.longest_prefix(name) == expected
+
+
+def test_open_compiled_database(database_csv):
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        expected = cookie_db.search("_gat_1234")
+
+    assert cookie_database.compiled_path(database_csv).exists()
+
+    with mock.patch.dict(cookie_database._cache, clear=True):  # a new process
+        with mock.patch.object(pd, "read_csv") as mock_read:
+            with cookie_database.CookieDatabase(database_csv) as cookie_db:
+                res = cookie_db.search("_gat_1234")
+
+    mock_read.assert_not_called()
+    assert isinstance(cookie_db.data, cookie_database.CompiledCookieData)
+    assert res == expected
+
+
+def test_recompile_stale_database(database_csv):
+    cookie_database.compile_database(database_csv)
+    with open(database_csv, "w") as f:
+        f.write("\n".join(COOKIE_CSV_EXAMPLE[:2]))
+
+    with cookie_database.CookieDatabase(database_csv) as cookie_db:
+        assert len(cookie_db.data) == 1
+
+
+def test_load_csv_without_compiled_database(database_csv):
+    with mock.patch.object(cookie_database, "compile_database", side_effect=OSError("read-only")):
+        with cookie_database.CookieDatabase(database_csv) as cookie_db:
+            res = cookie_db.search("_gat_1234")
+
+    assert not isinstance(cookie_db.data, cookie_database.CompiledCookieData)
+    assert res["id"] == "d7496a0e-7f4b-4e20-b288-9d5e4852fa79"
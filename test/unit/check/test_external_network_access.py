@@ -70,3 +70,16 @@ def test_check_subdomain_allowed(url, expected_status):
     res = CheckExternalNetworkAccess().check(page)
 
     assert res.status == expected_status
+
+
+def test_check_compares_canonical_urls():
+    domain = "https://local.url"
+    resources = [
+        Resource(url="https://LOCAL.url/content/image.jpg"),
+        Resource(url="https://local.url:443/content/style.css"),
+    ]
+    page = WebsitePage(url=f"{domain}/", title="Testsite", elements=resources, html="")
+
+    res = CheckExternalNetworkAccess().check(page)
+
+    assert res.status == Status.OK
@@ -1,6 +1,9 @@
 from pathlib import Path
+from unittest import mock
 
-from website_checker.crawl.browser import Browser
+from website_checker.crawl import browser as browser_module
+from website_checker.crawl.browser import Browser, ContextPool
+from website_checker.crawl.settle import SettleResult
 
 LOCAL_TEST_URL = Path(__file__).parent.parent.parent / "integration" / "data" / "index.html"
 
@@ -9,3 +12,185 @@ def test_browser():
     with Browser() as browser:
         page = browser.goto(f"file://{LOCAL_TEST_URL}")
         assert page
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.cleared = 0
+
+    def clear_cookies(self):
+        self.cleared += 1
+
+    def clear_permissions(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywrightBrowser:
+    def __init__(self):
+        self.options = []
+
+    def new_context(self, **options):
+        self.options.append(options)
+        return FakeContext()
+
+
+def test_context_pool_reuses_context():
+    pool = ContextPool(FakePlaywrightBrowser(), max_pages=3)
+
+    contexts = []
+    for _ in range(3):
+        context = pool.acquire()
+        contexts.append(context)
+        pool.release(context)
+
+    assert contexts[0] is contexts[1] is contexts[2]
+    assert contexts[0].cleared == 2
+    assert contexts[0].closed
+    assert pool.alive == 0
+    assert pool.created == 1
+
+
+def test_context_pool_recycles_after_max_pages():
+    pool = ContextPool(FakePlaywrightBrowser(), max_pages=2)
+
+    contexts = set()
+    for _ in range(10):
+        context = pool.acquire()
+        contexts.add(context)
+        assert pool.alive == 1
+        pool.release(context)
+
+    assert len(contexts) == 5
+    assert all(context.closed for context in contexts)
+
+
+def test_context_pool_blocks_service_workers():
+    browser = FakePlaywrightBrowser()
+    pool = ContextPool(browser, viewport={"width": 800, "height": 600})
+
+    pool.acquire()
+
+    assert browser.options == [{"service_workers": "block", "viewport": {"width": 800, "height": 600}}]
+
+
+def test_context_pool_discards_unclean_context():
+    pool = ContextPool(FakePlaywrightBrowser())
+
+    context = pool.acquire()
+    pool.release(context, reusable=False)
+
+    assert context.closed
+    assert pool.acquire() is not context
+
+
+def test_context_pool_close():
+    pool = ContextPool(FakePlaywrightBrowser(), max_idle=2)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+
+    pool.close()
+
+    assert first.closed and second.closed
+    assert pool.alive == 0
+
+
+def test_browser_is_reentrant():
+    with mock.patch.object(browser_module, "sync_playwright") as mock_playwright:
+        browser = Browser()
+        with browser:
+            with browser:
+                pass
+            mock_playwright.return_value.start.return_value.stop.assert_not_called()
+
+    mock_playwright.return_value.start.assert_called_once()
+    mock_playwright.return_value.start.return_value.stop.assert_called_once()
+
+
+def test_browser_renders_pdf_from_content():
+    with mock.patch.object(browser_module, "sync_playwright"):
+        with Browser() as browser:
+            context = browser._contexts.acquire()
+            browser._contexts.release(context)
+            page = context.new_page.return_value
+            page.pdf.return_value = b"%PDF"
+
+            pdf = browser.pdf("<h1>Report</h1>", format="A4")
+
+    page.set_content.assert_called_once_with("<h1>Report</h1>")
+    page.pdf.assert_called_once_with(path=None, format="A4")
+    page.close.assert_called_once()
+    assert pdf == b"%PDF"
+
+
+def test_browser_loads_every_page_without_cache():
+    settle = mock.Mock()
+    settle.goto.return_value = SettleResult("networkidle", "networkidle", 10.0)
+    with mock.patch.object(browser_module, "sync_playwright") as mock_playwright:
+        context = mock_playwright.return_value.start.return_value.chromium.launch.return_value.new_context.return_value
+        page = context.new_page.return_value
+        page.context = context
+        with Browser(settle=settle) as browser:
+            for url in ("https://domain.url/", "https://domain.url/a"):
+                browser.goto(url)
+                browser.close_page()
+
+    context.new_cdp_session.assert_called_with(page)
+    assert (
+        context.new_cdp_session.return_value.send.call_args_list
+        == [mock.call("Network.setCacheDisabled", {"cacheDisabled": True})] * 2
+    )
+
+
+def frame(url):
+    return mock.Mock(url=url)
+
+
+def open_page_with_frames(browser, context, frame_urls):
+    page = context.new_page.return_value
+    page.url = "https://domain.url/"
+    browser.goto(page.url)
+    handler = next(call.args[1] for call in page.on.call_args_list if call.args[0] == "framenavigated")
+    for url in frame_urls:
+        handler(frame(url))
+    return page
+
+
+def test_browser_clears_storage_of_frames():
+    settle = mock.Mock()
+    settle.goto.return_value = SettleResult("networkidle", "networkidle", 10.0)
+    with mock.patch.object(browser_module, "sync_playwright") as mock_playwright:
+        context = mock_playwright.return_value.start.return_value.chromium.launch.return_value.new_context.return_value
+        context.new_page.return_value.context = context
+        with Browser(settle=settle) as browser:
+            open_page_with_frames(
+                browser, context, ["https://domain.url/", "https://consent.test/frame.html", "about:blank"]
+            )
+            browser.close_page()
+
+            assert (
+                mock.call(
+                    "Storage.clearDataForOrigin",
+                    {"origin": "https://consent.test", "storageTypes": browser_module.FRAME_STORAGE_TYPES},
+                )
+                in context.new_cdp_session.return_value.send.call_args_list
+            )
+            assert browser._contexts._idle == [context]
+
+
+def test_browser_discards_context_with_uncleared_frames():
+    settle = mock.Mock()
+    settle.goto.return_value = SettleResult("networkidle", "networkidle", 10.0)
+    with mock.patch.object(browser_module, "sync_playwright") as mock_playwright:
+        context = mock_playwright.return_value.start.return_value.chromium.launch.return_value.new_context.return_value
+        context.new_page.return_value.context = context
+        with Browser(settle=settle) as browser:
+            open_page_with_frames(browser, context, ["https://consent.test/frame.html"])
+            context.new_cdp_session.side_effect = RuntimeError("target closed")
+            browser.close_page()
+
+            assert browser._contexts._idle == []
+            context.close.assert_called_once()
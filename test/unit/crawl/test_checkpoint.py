@@ -0,0 +1,73 @@
+import pytest
+
+from website_checker.crawl.checkpoint import CheckpointException, CrawlCheckpoint
+from website_checker.crawl.websitepage import WebsitePage
+
+BASE_URL = "https://domain.url"
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "state")
+    checkpoint.start(BASE_URL)
+    yield checkpoint
+    checkpoint.close()
+
+
+def test_checkpoint_restores_state(checkpoint):
+    for path in ["", "/a", "/b", "/c"]:
+        checkpoint.record_queued(f"{BASE_URL}{path}")
+    checkpoint.add_page(WebsitePage(url=f"{BASE_URL}/", title="Home"), visited=[BASE_URL, f"{BASE_URL}/"])
+    checkpoint.record_visited([f"{BASE_URL}/b"])
+    checkpoint.close()
+
+    restored = CrawlCheckpoint(checkpoint.state_dir)
+    restored.start(BASE_URL, resume=True)
+    pages = restored.load_pages()
+    remaining, visited = restored.load_links()
+
+    assert [page.title for page in pages] == ["Home"]
+    assert remaining == [f"{BASE_URL}/a", f"{BASE_URL}/c"]
+    assert visited == {BASE_URL, f"{BASE_URL}/b"}
+
+
+def test_checkpoint_without_resume_starts_fresh(checkpoint):
+    checkpoint.record_queued(BASE_URL)
+    checkpoint.add_page(WebsitePage(url=BASE_URL))
+    checkpoint.close()
+
+    fresh = CrawlCheckpoint(checkpoint.state_dir)
+    fresh.start(BASE_URL)
+
+    assert fresh.load_pages() == []
+    assert fresh.load_links() == ([], set())
+
+
+def test_checkpoint_ignores_truncated_records(checkpoint):
+    checkpoint.record_queued(f"{BASE_URL}/a")
+    checkpoint.add_page(WebsitePage(url=f"{BASE_URL}/a"))
+    checkpoint.add_page(WebsitePage(url=f"{BASE_URL}/b"))
+    checkpoint.close()
+    with open(checkpoint.links_path, "a") as f:
+        f.write('{"queued": "https://dom')
+    data = checkpoint.pages_path.read_bytes()
+    checkpoint.pages_path.write_bytes(data[:-5])
+
+    restored = CrawlCheckpoint(checkpoint.state_dir)
+    restored.start(BASE_URL, resume=True)
+    restored.record_queued(f"{BASE_URL}/c")
+    restored.add_page(WebsitePage(url=f"{BASE_URL}/c"))
+    restored.close()
+
+    again = CrawlCheckpoint(checkpoint.state_dir)
+    again.start(BASE_URL, resume=True)
+
+    assert [page.url for page in again.load_pages()] == [f"{BASE_URL}/a", f"{BASE_URL}/c"]
+    assert again.load_links()[0] == []
+
+
+def test_checkpoint_of_other_url(checkpoint):
+    checkpoint.close()
+
+    with pytest.raises(CheckpointException):
+        CrawlCheckpoint(checkpoint.state_dir).start("https://other.url", resume=True)
@@ -1,15 +1,21 @@
+import threading
+
 import pytest
 
+from website_checker.analyze.result import PageEvaluation
+from website_checker.crawl.checkpoint import CrawlCheckpoint
 from website_checker.crawl.cookie import Cookie
 from website_checker.crawl.crawler import (
-    add_element_sorted_unique,
+    Crawler,
     get_base_domain,
     get_unvisited_links,
     is_internal_link,
     link_already_visited,
     normalize_url,
 )
+from website_checker.crawl.recrawl import PageRecord
 from website_checker.crawl.resource import Resource
+from website_checker.crawl.settle import QUIET, SettleResult
 from website_checker.crawl.websitepage import WebsitePage
 
 BASE_URL = "https://domain.url"
@@ -134,18 +140,6 @@ def test_is_not_internal(url):
     assert not internal
 
 
-def test_add_element_sorted_unique():
-    data = ["bbb", "ddd"]
-    expected_data = ["aaa", "bbb", "ccc", "ddd", "eee"]
-
-    add_element_sorted_unique(data, "ccc")  # Add to middle
-    add_element_sorted_unique(data, "eee")  # Add to end
-    add_element_sorted_unique(data, "aaa")  # Add to beginning
-    add_element_sorted_unique(data, "bbb")  # Add duplicate
-
-    assert data == expected_data
-
-
 def test_collect_links():
     domain = "https://domain.test"
     links = {"https://domain.test", "https://domain.test/contact"}
@@ -170,3 +164,203 @@ def test_link_already_visited(current_url, visited_links, expected_result):
     res = link_already_visited(current_url, visited_links)
 
     assert res == expected_result
+
+
+class FakeElement:
+    def __init__(self, href):
+        self.href = href
+
+    def get_attribute(self, name):
+        return self.href
+
+
+class FakeContext:
+    def cookies(self):
+        return [browser_cookie()]
+
+
+class FakePage:
+    def __init__(self, url, links):
+        self.url = url
+        self.links = links
+        self.context = FakeContext()
+
+    def content(self):
+        return source()
+
+    def title(self):
+        return f"Title of {self.url}"
+
+    def screenshot(self, **kwargs):
+        return b"screenshot"
+
+    def query_selector_all(self, selector):
+        return [FakeElement(link) for link in self.links]
+
+
+class FakeBrowser:
+    """Serves a static site map without starting Playwright."""
+
+    def __init__(self, site, visits=None):
+        self.site = site
+        self.visits = [] if visits is None else visits
+        self.started = False
+        self.settled = None
+
+    def spawn(self):
+        return FakeBrowser(self.site, self.visits)
+
+    def goto(self, url, hooks=None, route=None):
+        self.visits.append(url)
+        self.settled = SettleResult(QUIET, QUIET, 10.0)
+        return FakePage(url, self.site.get(url, []))
+
+    def close_page(self):
+        pass
+
+    def __enter__(self):
+        self.started = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.started = False
+
+
+@pytest.fixture
+def fake_site():
+    return {
+        BASE_URL: ["/a", "/b", "/c"],
+        f"{BASE_URL}/a": ["/b", "/d"],
+        f"{BASE_URL}/b": ["/a", "/e", "https://external.test/page"],
+        f"{BASE_URL}/c": [],
+        f"{BASE_URL}/d": ["/"],
+        f"{BASE_URL}/e": ["/c"],
+    }
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_crawler_visits_each_page_once(fake_site, concurrency):
+    browser = FakeBrowser(fake_site)
+
+    with Crawler(browser, BASE_URL, concurrency=concurrency) as crawler:
+        pages = list(crawler)
+
+    assert sorted(page.url for page in pages) == sorted(fake_site)
+    assert sorted(browser.visits) == sorted(fake_site)
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_crawler_requests_links_as_found(concurrency):
+    site = {
+        f"{BASE_URL}/": ["/blog/", "/about?X=1", "/blog/#comments"],
+        f"{BASE_URL}/blog/": ["/", "/about?X=1"],
+        f"{BASE_URL}/about?X=1": [],
+    }
+    browser = FakeBrowser(site)
+
+    with Crawler(browser, f"{BASE_URL}/", concurrency=concurrency) as crawler:
+        list(crawler)
+
+    assert sorted(browser.visits) == sorted(site)
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_crawler_skips_links_with_invalid_port(fake_site, concurrency):
+    fake_site[BASE_URL] = fake_site[BASE_URL] + ["http://localhost:PORT/x", "https://a.com:99999/"]
+    browser = FakeBrowser(fake_site)
+
+    with Crawler(browser, BASE_URL, concurrency=concurrency) as crawler:
+        pages = list(crawler)
+
+    assert sorted(page.url for page in pages) == sorted(fake_site)
+
+
+def test_crawler_crawls_breadth_first(fake_site):
+    browser = FakeBrowser(fake_site)
+
+    with Crawler(browser, BASE_URL) as crawler:
+        urls = [page.url for page in crawler]
+
+    assert urls == [BASE_URL] + [f"{BASE_URL}/{path}" for path in "abcde"]
+
+
+def test_crawler_records_settle_time(fake_site):
+    with Crawler(FakeBrowser(fake_site), BASE_URL) as crawler:
+        page = next(crawler)
+
+    assert page.settle == SettleResult(QUIET, QUIET, 10.0)
+
+
+def test_crawler_seed(fake_site):
+    fake_site[f"{BASE_URL}/orphan/"] = []
+    browser = FakeBrowser(fake_site)
+    crawler = Crawler(browser, BASE_URL)
+
+    added = crawler.seed(
+        [
+            f"{BASE_URL}/",
+            f"{BASE_URL}/orphan/",
+            f"{BASE_URL}/a",
+            "https://external.test/page",
+            f"{BASE_URL}/images/photo.jpg",
+        ]
+    )
+    with crawler:
+        urls = [page.url for page in crawler]
+
+    assert added == 2
+    assert urls[:3] == [BASE_URL, f"{BASE_URL}/orphan/", f"{BASE_URL}/a"]
+    assert sorted(urls) == sorted(fake_site)
+
+
+class UnchangedPages:
+    def __init__(self, records):
+        self.records = records
+
+    def is_unchanged(self, url):
+        return url in self.records
+
+    def get(self, url):
+        return self.records[url]
+
+
+def test_crawler_skips_unchanged_pages(fake_site):
+    record = PageRecord(url=BASE_URL, links=[f"{BASE_URL}/a"], evaluation=PageEvaluation(url=BASE_URL, title="Home"))
+    browser = FakeBrowser(fake_site)
+
+    with Crawler(browser, BASE_URL, recrawl=UnchangedPages({BASE_URL: record})) as crawler:
+        pages = list(crawler)
+
+    assert pages[0].not_modified
+    assert pages[0].title == "Home"
+    assert BASE_URL not in browser.visits
+    assert sorted(browser.visits) == [f"{BASE_URL}/{path}" for path in "abcde"]
+
+
+def test_crawler_resumes_from_checkpoint(fake_site, tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path)
+    checkpoint.start(BASE_URL)
+    with Crawler(FakeBrowser(fake_site), BASE_URL, checkpoint=checkpoint) as crawler:
+        first_pages = [next(crawler), next(crawler)]
+    checkpoint.close()
+
+    checkpoint = CrawlCheckpoint(tmp_path)
+    checkpoint.start(BASE_URL, resume=True)
+    browser = FakeBrowser(fake_site)
+    with Crawler(browser, BASE_URL, checkpoint=checkpoint) as crawler:
+        remaining_pages = list(crawler)
+    checkpoint.close()
+
+    assert [page.url for page in checkpoint.load_pages()] == [page.url for page in first_pages]
+    assert sorted(page.url for page in first_pages + remaining_pages) == sorted(fake_site)
+    assert BASE_URL not in browser.visits
+
+
+def test_concurrent_crawler_stops_early(fake_site):
+    browser = FakeBrowser(fake_site)
+
+    with Crawler(browser, BASE_URL, concurrency=2) as crawler:
+        first_page = next(crawler)
+
+    assert first_page.url == BASE_URL
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("crawler-worker")]
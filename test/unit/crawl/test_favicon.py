@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+import requests
+
+from website_checker.crawl.crawler import add_favicon_results, start_favicon_checks
+from website_checker.crawl.favicon import FaviconVerifier
+from website_checker.crawl.resource import Resource, ResourceRequest
+
+BASE_URL = "https://domain.url"
+
+
+class FakeResponse:
+    def __init__(self, status_code, content_type):
+        self.status_code = status_code
+        self.headers = {"content-type": content_type}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            self.requested.append(url)
+        if url not in self.responses:
+            raise requests.exceptions.ConnectionError(url)
+        return FakeResponse(*self.responses[url])
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session():
+    return FakeSession(
+        {
+            f"{BASE_URL}/favicon.ico": (200, "image/x-icon"),
+            f"{BASE_URL}/icon.html": (200, "text/html"),
+            f"{BASE_URL}/missing.png": (404, "text/html"),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "path, expected_loads",
+    [
+        ("/favicon.ico", True),
+        ("/icon.html", False),
+        ("/missing.png", False),
+        ("/unreachable.png", False),
+    ],
+)
+def test_verify_favicon(session, path, expected_loads):
+    with FaviconVerifier(session=session) as verifier:
+        loads, _ = verifier.verify(f"{BASE_URL}{path}")
+
+    assert loads == expected_loads
+
+
+def test_verifier_requests_each_url_once(session):
+    url = f"{BASE_URL}/favicon.ico"
+
+    with FaviconVerifier(session=session) as verifier:
+        results = [verifier.verify(url) for _ in range(10)]
+
+    assert session.requested == [url]
+    assert all(result[0] for result in results)
+
+
+def test_favicon_results_of_page(session):
+    html = (
+        '<head><link rel="icon" href="/favicon.ico"><link rel="shortcut icon" href="missing.png">'
+        '<link rel="icon" href="data:image/png;base64,iVBORw0KGgo="></head>'
+    )
+    elements = [Resource(url=f"{BASE_URL}/style.css")]
+    failed_requests = []
+
+    with FaviconVerifier(session=session) as verifier:
+        checks = start_favicon_checks(BASE_URL, BASE_URL, html, verifier)
+        add_favicon_results(checks, elements, failed_requests)
+
+    assert [element.url for element in elements] == [f"{BASE_URL}/style.css", f"{BASE_URL}/favicon.ico"]
+    assert len(failed_requests) == 1
+    assert isinstance(failed_requests[0], ResourceRequest)
+    assert failed_requests[0].url == f"{BASE_URL}/missing.png"
@@ -0,0 +1,79 @@
+import pytest
+
+from website_checker.crawl.frontier import DEPTH, FIFO, Frontier, url_depth
+
+BASE_URL = "https://domain.url"
+
+
+def test_frontier_fifo():
+    frontier = Frontier(FIFO)
+    for path in ["/b", "/a/deep/page", "/c", "/b"]:
+        frontier.push(f"{BASE_URL}{path}")
+
+    res = [frontier.pop() for _ in range(len(frontier))]
+
+    assert res == [f"{BASE_URL}/b", f"{BASE_URL}/a/deep/page", f"{BASE_URL}/c"]
+
+
+def test_frontier_depth():
+    frontier = Frontier(DEPTH)
+    for path in ["/a/deep/page", "/b/c", "/d", "/e"]:
+        frontier.push(f"{BASE_URL}{path}")
+
+    res = [frontier.pop() for _ in range(len(frontier))]
+
+    assert res == [f"{BASE_URL}/d", f"{BASE_URL}/e", f"{BASE_URL}/b/c", f"{BASE_URL}/a/deep/page"]
+
+
+def test_frontier_custom_score():
+    frontier = Frontier(lambda url: -len(url))
+    for path in ["/a", "/ccc", "/bb"]:
+        frontier.push(f"{BASE_URL}{path}")
+
+    assert list(frontier) == [f"{BASE_URL}/ccc", f"{BASE_URL}/bb", f"{BASE_URL}/a"]
+    assert frontier.pop() == f"{BASE_URL}/ccc"
+
+
+@pytest.mark.parametrize("order", [FIFO, DEPTH])
+def test_frontier_membership(order):
+    frontier = Frontier(order)
+    url = f"{BASE_URL}/page"
+
+    assert frontier.push(url)
+    assert not frontier.push(url)
+    assert url in frontier
+    assert len(frontier) == 1
+
+    frontier.pop()
+
+    assert url not in frontier
+    assert not frontier
+    with pytest.raises(IndexError):
+        frontier.pop()
+
+
+def test_frontier_invalid_order():
+    with pytest.raises(ValueError):
+        Frontier("random")
+
+
+@pytest.mark.parametrize(
+    "url, expected_depth",
+    [
+        (BASE_URL, 0),
+        (f"{BASE_URL}/", 0),
+        (f"{BASE_URL}/service/", 1),
+        (f"{BASE_URL}/service/pc?id=1", 2),
+    ],
+)
+def test_url_depth(url, expected_depth):
+    assert url_depth(url) == expected_depth
+
+
+def test_frontier_compares_canonical_urls():
+    frontier = Frontier()
+    frontier.push(f"{BASE_URL}/page/")
+
+    assert not frontier.push(f"{BASE_URL}/page#section")
+    assert "https://DOMAIN.url:443/page" in frontier
+    assert frontier.pop() == f"{BASE_URL}/page/"
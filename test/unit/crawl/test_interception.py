@@ -0,0 +1,129 @@
+import pytest
+
+from website_checker.crawl.crawler import PageTraffic
+from website_checker.crawl.interception import (
+    ABORT,
+    InterceptionPolicy,
+    ResourceInterceptor,
+)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="image", method="GET", failure=None):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+        self.failure = failure
+
+    def sizes(self):
+        return {"requestBodySize": 0, "requestHeadersSize": 10, "responseBodySize": 5, "responseHeadersSize": 10}
+
+
+class FakeResponse:
+    def __init__(self, url, status=200, headers=None):
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+
+
+class FakeRoute:
+    def __init__(self, response=None):
+        self.response = response
+        self.action = None
+        self.fetched_method = None
+        self.fulfilled = None
+
+    def fetch(self, method=None):
+        self.fetched_method = method
+        if self.response is None:
+            raise RuntimeError("connection refused")
+        return self.response
+
+    def continue_(self):
+        self.action = "continue"
+
+    def abort(self, error_code=None):
+        self.action = "abort"
+
+    def fulfill(self, status=None, headers=None, body=None):
+        self.action = "fulfill"
+        self.fulfilled = (status, headers, body)
+
+
+IMAGE_URL = "https://domain.test/big.png"
+IMAGE_HEADERS = {"content-type": "image/png", "content-length": "2000000"}
+
+
+def test_interceptor_stubs_heavy_resources():
+    interceptor = ResourceInterceptor(InterceptionPolicy())
+    route = FakeRoute(FakeResponse(IMAGE_URL, headers=IMAGE_HEADERS))
+
+    interceptor.handle(route, FakeRequest(IMAGE_URL))
+
+    assert route.fetched_method == "HEAD"
+    assert route.action == "fulfill"
+    assert route.fulfilled == (200, {"content-type": "image/png"}, b"")
+    meta = interceptor.intercepted[IMAGE_URL]
+    assert meta.status == 200
+    assert meta.size == 2000000
+    assert meta.to_request().sizes["responseBodySize"] == 2000000
+
+
+def test_interceptor_aborts_heavy_resources():
+    interceptor = ResourceInterceptor(InterceptionPolicy(action=ABORT))
+    route = FakeRoute(FakeResponse(IMAGE_URL, status=301, headers=IMAGE_HEADERS))
+
+    interceptor.handle(route, FakeRequest(IMAGE_URL))
+
+    assert route.action == "abort"
+    assert interceptor.intercepted[IMAGE_URL].to_resource().status_code == 301
+
+
+@pytest.mark.parametrize(
+    "request_, response",
+    [
+        (FakeRequest("https://domain.test/app.js", resource_type="script"), FakeResponse(IMAGE_URL)),
+        (FakeRequest(IMAGE_URL, method="POST"), FakeResponse(IMAGE_URL)),
+        (FakeRequest(IMAGE_URL), None),
+        (FakeRequest(IMAGE_URL), FakeResponse(IMAGE_URL, headers={"content-length": "10"})),
+        (FakeRequest(IMAGE_URL), FakeResponse(IMAGE_URL, status=404, headers=IMAGE_HEADERS)),
+        (FakeRequest(IMAGE_URL), FakeResponse(IMAGE_URL, status=405, headers=IMAGE_HEADERS)),
+        (FakeRequest(IMAGE_URL), FakeResponse(IMAGE_URL, headers={"content-type": "image/png"})),
+        (FakeRequest(IMAGE_URL), FakeResponse(IMAGE_URL, headers={"content-length": "unknown"})),
+    ],
+)
+def test_interceptor_continues(request_, response):
+    interceptor = ResourceInterceptor(InterceptionPolicy(min_size=1000))
+    route = FakeRoute(response)
+
+    interceptor.handle(route, request_)
+
+    assert route.action == "continue"
+    assert not interceptor.intercepted
+
+
+def test_interception_policy_invalid_action():
+    with pytest.raises(ValueError):
+        InterceptionPolicy(action="drop")
+
+
+def test_page_traffic_uses_intercepted_metadata():
+    traffic = PageTraffic(InterceptionPolicy(action=ABORT))
+    aborted = FakeRequest(IMAGE_URL, failure="net::ERR_BLOCKED_BY_CLIENT")
+    traffic.route(FakeRoute(FakeResponse(IMAGE_URL, headers=IMAGE_HEADERS)), aborted)
+    traffic.failed_requests = [aborted, FakeRequest("https://domain.test/broken.js", failure="net::ERR_FAILED")]
+    traffic.requests = [FakeRequest("https://domain.test/app.js")]
+
+    assert [resource.url for resource in traffic.resources()] == [IMAGE_URL]
+    assert {req.url: req.sizes["responseBodySize"] for req in traffic.fine_requests()} == {
+        "https://domain.test/app.js": 5,
+        IMAGE_URL: 2000000,
+    }
+    assert [req.url for req in traffic.failed()] == ["https://domain.test/broken.js"]
+
+
+def test_page_traffic_without_interception():
+    traffic = PageTraffic()
+
+    assert traffic.route is None
+    assert traffic.intercepted == {}
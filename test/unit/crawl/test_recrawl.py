@@ -0,0 +1,121 @@
+import pytest
+
+from website_checker.analyze.result import PageEvaluation, Result, Status
+from website_checker.crawl.recrawl import RecrawlCache
+from website_checker.crawl.sitemap import SitemapEntry
+from website_checker.crawl.websitepage import WebsitePage
+
+BASE_URL = "https://domain.url"
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class FakeSession:
+    def __init__(self, status_code=304):
+        self.status_code = status_code
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        return FakeResponse(self.status_code)
+
+
+def evaluation(url=BASE_URL):
+    result = Result(title="Test", description="Description", result={"text": "Result"}, status=Status.OK)
+    return PageEvaluation(url=url, title="Home", results=[result])
+
+
+def crawled_page(html="<h1>Home</h1>", headers=None):
+    return WebsitePage(url=BASE_URL, title="Home", html=html, headers=headers, links=[f"{BASE_URL}/contact"])
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "recrawl.pickle"
+
+
+def former_run(cache_file, page, lastmods=()):
+    cache = RecrawlCache(cache_file, session=FakeSession())
+    cache.set_lastmods(lastmods)
+    cache.update(page, evaluation())
+    cache.save()
+
+
+def test_unchanged_by_conditional_request(cache_file):
+    former_run(cache_file, crawled_page(headers={"etag": '"abc"', "last-modified": "Mon, 01 May 2023 10:00:00 GMT"}))
+    session = FakeSession(304)
+
+    cache = RecrawlCache(cache_file, session=session)
+
+    assert cache.is_unchanged(f"{BASE_URL}/")
+    assert session.requests == [
+        (BASE_URL, {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 May 2023 10:00:00 GMT"})
+    ]
+
+
+def test_changed_by_conditional_request(cache_file):
+    former_run(cache_file, crawled_page(headers={"etag": '"abc"'}))
+
+    cache = RecrawlCache(cache_file, session=FakeSession(200))
+
+    assert not cache.is_unchanged(BASE_URL)
+
+
+def test_unchanged_by_sitemap_lastmod(cache_file):
+    former_run(cache_file, crawled_page(), lastmods=[SitemapEntry(BASE_URL, "2023-05-01")])
+    session = FakeSession(200)
+
+    cache = RecrawlCache(cache_file, session=session)
+    cache.set_lastmods([SitemapEntry(BASE_URL, "2023-05-01")])
+    assert cache.is_unchanged(BASE_URL)
+
+    cache.set_lastmods([SitemapEntry(BASE_URL, "2023-06-01")])
+    assert not cache.is_unchanged(BASE_URL)
+    assert not session.requests
+
+
+def test_unknown_page_is_changed(cache_file):
+    cache = RecrawlCache(cache_file, session=FakeSession())
+
+    assert not cache.is_unchanged(BASE_URL)
+
+
+def test_reusable_evaluation_of_not_modified_page(cache_file):
+    former_run(cache_file, crawled_page())
+
+    cache = RecrawlCache(cache_file, session=FakeSession())
+
+    reused = cache.reusable_evaluation(WebsitePage(url=BASE_URL, not_modified=True))
+    assert reused.title == "Home"
+    assert reused.results[0].title == "Test"
+
+
+def test_rendered_page_is_analyzed_again(cache_file):
+    former_run(cache_file, crawled_page())
+    cache = RecrawlCache(cache_file, session=FakeSession())
+    page = crawled_page()  # same html, but cookies and resources may differ
+    page.cookies = [{"name": "tracking", "value": "1", "domain": "domain.url"}]
+
+    assert cache.reusable_evaluation(page) is None
+
+
+def test_not_modified_page_keeps_record(cache_file):
+    former_run(cache_file, crawled_page(headers={"etag": '"abc"'}))
+    cache = RecrawlCache(cache_file, session=FakeSession())
+    page = WebsitePage(url=BASE_URL, not_modified=True)
+
+    cache.update(page, cache.reusable_evaluation(page))
+    cache.save()
+
+    record = RecrawlCache(cache_file).get(BASE_URL)
+    assert record.etag == '"abc"'
+    assert record.links == [f"{BASE_URL}/contact"]
@@ -0,0 +1,96 @@
+import io
+import pickle
+from concurrent.futures import Future
+
+import pytest
+
+from website_checker.crawl.screenshot import (
+    ALL,
+    FIRST,
+    NONE,
+    PNG,
+    SAMPLED,
+    WEBP,
+    ScreenshotPolicy,
+    Screenshotter,
+)
+from website_checker.crawl.websitepage import WebsitePage
+from website_checker.utils import image_mime_type
+
+
+def png_image(width=40, height=20):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakePage:
+    def __init__(self, data=b"\xff\xd8\xff\xe0 jpeg"):
+        self.data = data
+        self.options = []
+
+    def screenshot(self, **kwargs):
+        self.options.append(kwargs)
+        return self.data
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        (NONE, [False] * 5),
+        (FIRST, [True, False, False, False, False]),
+        (SAMPLED, [True, False, True, False, True]),
+        (ALL, [True] * 5),
+    ],
+)
+def test_screenshotter_wanted(mode, expected):
+    screenshotter = Screenshotter(ScreenshotPolicy(mode=mode, sample_every=2))
+
+    assert [screenshotter.wanted() for _ in range(5)] == expected
+
+
+def test_screenshotter_capture_jpeg():
+    page = FakePage()
+    clip = {"x": 0, "y": 0, "width": 1280, "height": 720}
+
+    with Screenshotter(ScreenshotPolicy(quality=60, clip=clip)) as screenshotter:
+        screenshot, thumbnail = screenshotter.capture(page)
+        assert screenshotter.capture(page) == (None, None)
+
+    assert screenshot == page.data
+    assert thumbnail is None
+    assert page.options == [{"scale": "css", "clip": clip, "type": "jpeg", "quality": 60}]
+
+
+def test_screenshotter_encodes_in_background():
+    page = FakePage(png_image())
+
+    with Screenshotter(ScreenshotPolicy(format=WEBP, thumbnail_width=10)) as screenshotter:
+        screenshot, thumbnail = screenshotter.capture(page)
+
+    assert isinstance(screenshot, Future)
+    assert image_mime_type(screenshot.result()) == "image/webp"
+    Image = pytest.importorskip("PIL.Image")
+    with Image.open(io.BytesIO(thumbnail.result())) as image:
+        assert image.size == (10, 5)
+
+
+def test_screenshot_policy_invalid():
+    with pytest.raises(ValueError):
+        ScreenshotPolicy(mode="some")
+    with pytest.raises(ValueError):
+        ScreenshotPolicy(format="gif")
+    assert not ScreenshotPolicy(format=PNG).needs_pillow
+
+
+def test_website_page_resolves_screenshot():
+    future: Future = Future()
+    page = WebsitePage(url="https://domain.test", screenshot=future)
+    future.set_result(b"\x89PNG")
+
+    restored = pickle.loads(pickle.dumps(page))
+
+    assert page.screenshot == b"\x89PNG"
+    assert restored.screenshot == b"\x89PNG"
+    assert restored.thumbnail is None
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from website_checker.crawl.settle import (
+    BUDGET,
+    NETWORK_IDLE,
+    QUIET,
+    NetworkIdleSettle,
+    QuietWindowSettle,
+    make_settle_strategy,
+)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="fetch"):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakePage:
+    """Replays network events while the settle strategy waits."""
+
+    def __init__(self, events=()):
+        self.handlers = {}
+        self.events = list(events)  # (at milliseconds, event, request)
+        self.wait_until = None
+        self.start = None
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def goto(self, url, wait_until=None, timeout=None):
+        self.wait_until = wait_until
+        self.start = time.monotonic()
+        self._emit()
+
+    def wait_for_timeout(self, timeout):
+        time.sleep(timeout / 1000)
+        self._emit()
+
+    def _emit(self):
+        elapsed = (time.monotonic() - self.start) * 1000
+        while self.events and self.events[0][0] <= elapsed:
+            _, event, request = self.events.pop(0)
+            for handler in self.handlers.get(event, []):
+                handler(request)
+
+
+def test_network_idle_settle():
+    page = FakePage()
+
+    result = NetworkIdleSettle().goto(page, "https://domain.test")
+
+    assert page.wait_until == "networkidle"
+    assert result.strategy == NETWORK_IDLE
+    assert result.reason == NETWORK_IDLE
+
+
+def test_quiet_window_settle_waits_for_pending_requests():
+    api = FakeRequest("https://domain.test/api")
+    page = FakePage([(0, "request", api), (100, "requestfinished", api)])
+
+    result = QuietWindowSettle(quiet_window=50, budget=2000).goto(page, "https://domain.test")
+
+    assert page.wait_until == "domcontentloaded"
+    assert result.reason == QUIET
+    assert 150 <= result.duration < 2000
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        FakeRequest("https://www.google-analytics.com/g/collect?v=2"),
+        FakeRequest("https://domain.test/events", resource_type="eventsource"),
+        FakeRequest("https://domain.test/video.mp4", resource_type="media"),
+    ],
+)
+def test_quiet_window_settle_ignores_long_lived_requests(request_):
+    page = FakePage([(0, "request", request_)])
+
+    result = QuietWindowSettle(quiet_window=50, budget=2000).goto(page, "https://domain.test")
+
+    assert result.reason == QUIET
+    assert result.duration < 1000
+
+
+def test_quiet_window_settle_treats_long_requests_as_long_polling():
+    page = FakePage([(0, "request", FakeRequest("https://domain.test/poll"))])
+
+    result = QuietWindowSettle(quiet_window=50, budget=2000, long_request=100).goto(page, "https://domain.test")
+
+    assert result.reason == QUIET
+    assert 100 <= result.duration < 1000
+
+
+def test_quiet_window_settle_budget():
+    events = [(at, "request", FakeRequest(f"https://domain.test/{at}")) for at in range(0, 1000, 20)]
+    page = FakePage(events)
+
+    result = QuietWindowSettle(quiet_window=50, budget=200).goto(page, "https://domain.test")
+
+    assert result.reason == BUDGET
+    assert 200 <= result.duration < 1000
+
+
+def test_make_settle_strategy():
+    assert isinstance(make_settle_strategy(), NetworkIdleSettle)
+    assert make_settle_strategy(QUIET, budget=100).budget == 100
+    with pytest.raises(ValueError):
+        make_settle_strategy("load")
@@ -0,0 +1,117 @@
+import gzip
+import io
+
+import pytest
+import requests
+
+from website_checker.crawl.sitemap import SitemapEntry, find_sitemaps, iter_sitemap_urls
+
+BASE_URL = "https://domain.url"
+
+SITEMAP_INDEX = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>{BASE_URL}/sitemap-pages.xml</loc></sitemap>
+    <sitemap><loc>{BASE_URL}/sitemap-posts.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+SITEMAP_PAGES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>{BASE_URL}/</loc><lastmod>2023-05-01</lastmod></url>
+    <url><loc> {BASE_URL}/contact </loc></url>
+</urlset>"""
+
+SITEMAP_POSTS = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>{BASE_URL}/blog/hello-world</loc><lastmod>2023-06-01T10:00:00+00:00</lastmod></url>
+</urlset>"""
+
+
+SITEMAP_IMAGES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+    <url>
+        <loc>{BASE_URL}/gallery</loc>
+        <image:image><image:loc>{BASE_URL}/images/photo.jpg</image:loc></image:image>
+        <lastmod>2023-07-01</lastmod>
+    </url>
+</urlset>"""
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.text = content.decode(errors="ignore")
+        self.raw = io.BytesIO(content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(self.status_code)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class FakeSession:
+    def __init__(self, files):
+        self.files = files
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url not in self.files:
+            return FakeResponse(b"Not found", status_code=404)
+        return FakeResponse(self.files[url])
+
+
+@pytest.fixture
+def site_files():
+    return {
+        f"{BASE_URL}/robots.txt": f"User-agent: *\nDisallow:\nSitemap: {BASE_URL}/sitemap_index.xml\n".encode(),
+        f"{BASE_URL}/sitemap_index.xml": SITEMAP_INDEX.encode(),
+        f"{BASE_URL}/sitemap-pages.xml": SITEMAP_PAGES.encode(),
+        f"{BASE_URL}/sitemap-posts.xml.gz": gzip.compress(SITEMAP_POSTS.encode()),
+    }
+
+
+def test_find_sitemaps_in_robots_txt(site_files):
+    assert find_sitemaps(BASE_URL, FakeSession(site_files)) == [f"{BASE_URL}/sitemap_index.xml"]
+
+
+def test_find_default_sitemap():
+    assert find_sitemaps(BASE_URL, FakeSession({})) == [f"{BASE_URL}/sitemap.xml"]
+
+
+def test_iter_sitemap_urls(site_files):
+    entries = list(iter_sitemap_urls(BASE_URL, FakeSession(site_files)))
+
+    assert entries == [
+        SitemapEntry(url=f"{BASE_URL}/", lastmod="2023-05-01"),
+        SitemapEntry(url=f"{BASE_URL}/contact"),
+        SitemapEntry(url=f"{BASE_URL}/blog/hello-world", lastmod="2023-06-01T10:00:00+00:00"),
+    ]
+
+
+def test_iter_sitemap_urls_ignores_image_locs(site_files):
+    site_files[f"{BASE_URL}/sitemap-pages.xml"] = SITEMAP_IMAGES.encode()
+
+    entries = list(iter_sitemap_urls(BASE_URL, FakeSession(site_files)))
+
+    assert entries[0] == SitemapEntry(url=f"{BASE_URL}/gallery", lastmod="2023-07-01")
+    assert f"{BASE_URL}/images/photo.jpg" not in [entry.url for entry in entries]
+
+
+def test_iter_sitemap_urls_skips_invalid_sitemap(site_files):
+    site_files[f"{BASE_URL}/sitemap-pages.xml"] = b"<urlset><url><loc>"
+    session = FakeSession(site_files)
+
+    entries = list(iter_sitemap_urls(BASE_URL, session))
+
+    assert [entry.url for entry in entries] == [f"{BASE_URL}/blog/hello-world"]
+
+
+def test_iter_sitemap_urls_without_sitemap():
+    assert list(iter_sitemap_urls(BASE_URL, FakeSession({}))) == []
@@ -0,0 +1,34 @@
+import pickle
+from unittest.mock import patch
+
+from website_checker.analyze.visitor import traverse
+from website_checker.check.heading_structure import CheckHeadingStructure
+from website_checker.check.semantic_html import CheckSemanticHtml
+from website_checker.crawl import websitepage
+from website_checker.crawl.websitepage import WebsitePage
+
+
+def test_soup_is_parsed_once(page):
+    with patch.object(websitepage, "BeautifulSoup", wraps=websitepage.BeautifulSoup) as mock_soup:
+        traverse(page, [CheckHeadingStructure()])
+        traverse(page, [CheckSemanticHtml()])
+
+    assert mock_soup.call_count == 1
+
+
+def test_soup_follows_html():
+    page = WebsitePage(html="<h1>First</h1>")
+    assert page.soup.h1.text == "First"
+
+    page.html = "<h1>Second</h1>"
+
+    assert page.soup.h1.text == "Second"
+
+
+def test_soup_is_not_pickled(page):
+    page.soup
+
+    restored = pickle.loads(pickle.dumps(page))
+
+    assert restored._soup is None
+    assert restored.soup.title.text == page.soup.title.text
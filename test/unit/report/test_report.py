@@ -1,5 +1,6 @@
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from unittest import mock
 
 import pytest
 
@@ -62,6 +63,17 @@ def test_pdf_report_jinja(tmp_file, mock_report_data):
     assert pdf_file.exists()
 
 
+def test_pdf_report_with_browser(tmp_file, mock_report_data):
+    browser = mock.MagicMock()
+
+    pdf_file = report.PDFReport(browser=browser).render(mock_report_data, tmp_file)
+
+    assert pdf_file == tmp_file
+    html = browser.pdf.call_args.args[0]
+    assert "<html" in html
+    assert browser.pdf.call_args.kwargs["path"] == tmp_file
+
+
 def test_adapter(eval_pages):
     context = adapter(eval_pages)
 
@@ -79,6 +91,14 @@ def test_html_report_using_adapter(tmp_file, eval_pages):
     assert html_file.exists()
 
 
+def test_html_report_shows_thumbnails(tmp_file, eval_pages):
+    eval_pages[0].thumbnail = b"\xff\xd8\xff\xe0"
+
+    html_file = report.HTMLReport().render(adapter(eval_pages), tmp_file)
+
+    assert '<img class="thumbnail" alt="" src="data:image/jpeg;base64,/9j/4A==">' in html_file.read_text()
+
+
 def test_pdf_report_using_adapter(tmp_file, eval_pages):
     output_file = tmp_file
 
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pytest
+
+from website_checker.report.report_data import ReportData
+
+
+def test_to_dict_does_not_copy():
+    pages = [object()]
+    data = ReportData(url="https://domain.test", pages=pages, creation_date=datetime(2023, 8, 21, 9, 5))
+
+    context = data.to_dict()
+
+    assert context["pages"] is pages
+    assert context["creation_date"] == "21.08.2023 09:05"
+
+
+def test_to_dict_skips_unset_fields():
+    context = ReportData(url="https://domain.test").to_dict()
+
+    assert set(context) == {"url", "screenshot_type", "creation_date"}
+    assert len(context) == 3
+    assert "pages" not in context
+    with pytest.raises(KeyError):
+        context["screenshot"]
+
+
+def test_to_dict_follows_data():
+    data = ReportData(url="https://domain.test")
+    context = data.to_dict()
+
+    data.tags = ["WordPress"]
+
+    assert context["tags"] == ["WordPress"]
+    assert dict(context)["url"] == "https://domain.test"
@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from unittest import mock
 
 import pytest
 
@@ -87,3 +88,40 @@ def test_html_to_pdf_file(html_bytes, html_tmp_file):
 
     assert Path(html_tmp_file).is_file()
     assert file_bytes == expected_bytes
+
+
+def test_html_to_pdf_with_browser(html_bytes):
+    browser = mock.MagicMock()
+    browser.pdf.return_value = b"%PDF"
+
+    pdf_bytes = utilities.html_to_pdf(html_bytes, browser=browser)
+
+    assert pdf_bytes == b"%PDF"
+    assert browser.pdf.call_args.args[0] == html_bytes.decode()
+    browser.__enter__.assert_called_once()
+
+
+def test_build_html_reuses_environment(html_template):
+    context = ReportData(url="https://www.example.com")
+    environment = utilities.get_environment(html_template.parent)
+
+    with mock.patch.object(environment, "compile", wraps=environment.compile) as mock_compile:
+        first = utilities.build_html(html_template, context)
+        second = utilities.build_html(html_template, context)
+
+    assert utilities.get_environment(html_template.parent) is environment
+    assert not environment.auto_reload
+    assert mock_compile.call_count == 1
+    assert first == second
+
+
+def test_build_html_with_compiled_templates(tmp_path):
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    (template_dir / "report.html").write_text("<h1>{{ url }}</h1>")
+    compiled_dir = utilities.compile_templates(template_dir, tmp_path / "compiled")
+    (template_dir / "report.html").write_text("<h2>{{ url }}</h2>")  # not compiled
+
+    template = utilities.get_environment(template_dir, compiled_dir).get_template("report.html")
+
+    assert template.render(url="https://www.example.com") == "<h1>https://www.example.com</h1>"
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 from unittest import mock
 
@@ -5,12 +7,13 @@ import pytest
 from click.testing import CliRunner
 
 from website_checker.cli import main
+from website_checker.crawl import screenshot
 
 
 @pytest.fixture
 def mock_website_check():
     mocked_result = (Path("report.pdf"), None, None)
-    with mock.patch("website_checker.cli.run_full_analysis", return_value=mocked_result) as mock_check:
+    with mock.patch("website_checker.main.run_full_analysis", return_value=mocked_result) as mock_check:
         yield mock_check
 
 
@@ -52,6 +55,132 @@ def test_cli_save(mock_website_check):
     assert result.exit_code == 0
 
 
+def test_cli_workers(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--workers', '4'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["concurrency"] == 4
+
+    result = runner.invoke(main, ['domain.url', '-w', '0'])
+    assert result.exit_code == 2
+
+
+def test_cli_resume(mock_website_check, tmp_path):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--state-dir', str(tmp_path), '--resume'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["state_dir"] == tmp_path
+    assert mock_website_check.call_args.kwargs["resume"]
+
+    result = runner.invoke(main, ['domain.url', '--resume'])
+    assert result.exit_code == 2
+
+
+def test_cli_sitemap(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--sitemap'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["seed_sitemaps"]
+
+
+def test_cli_lean(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url'])
+    assert mock_website_check.call_args.kwargs["lean"] is None
+
+    result = runner.invoke(main, ['domain.url', '--lean'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["lean"] == "stub"
+
+    result = runner.invoke(main, ['domain.url', '--lean', 'abort'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["lean"] == "abort"
+
+
+def test_cli_settle(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--settle', 'quiet'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["settle"] == "quiet"
+
+    result = runner.invoke(main, ['domain.url', '--settle', 'load'])
+    assert result.exit_code == 2
+
+
+def test_cli_screenshots(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--screenshots', 'all', '--screenshot-format', 'png'])
+    assert result.exit_code == 0
+    policy = mock_website_check.call_args.kwargs["screenshots"]
+    assert policy.mode == "all"
+    assert policy.format == "png"
+
+
+def test_cli_screenshot_policy(mock_website_check):
+    runner = CliRunner()
+
+    with mock.patch.object(screenshot, "HAS_PILLOW", True):
+        result = runner.invoke(
+            main,
+            [
+                'domain.url',
+                '--screenshots',
+                'sampled',
+                '--screenshot-every',
+                '5',
+                '--screenshot-quality',
+                '60',
+                '--viewport',
+                '1280x720',
+                '--screenshot-clip',
+                '0,0,1280,400',
+                '--thumbnail-width',
+                '200',
+            ],
+        )
+    assert result.exit_code == 0
+    policy = mock_website_check.call_args.kwargs["screenshots"]
+    assert policy.sample_every == 5
+    assert policy.quality == 60
+    assert policy.viewport == {"width": 1280, "height": 720}
+    assert policy.clip == {"x": 0, "y": 0, "width": 1280, "height": 400}
+    assert policy.thumbnail_width == 200
+
+
+@pytest.mark.parametrize("option, value", [("--viewport", "1280"), ("--screenshot-clip", "0,0,1280")])
+def test_cli_invalid_screenshot_area(mock_website_check, option, value):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', option, value])
+    assert result.exit_code == 2
+
+
+def test_cli_analyze_workers(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url'])
+    assert mock_website_check.call_args.kwargs["analyze_workers"] == 1
+
+    result = runner.invoke(main, ['domain.url', '-a', '0'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.kwargs["analyze_workers"] == 0
+
+
+def test_cli_processes(mock_website_check):
+    runner = CliRunner()
+
+    result = runner.invoke(main, ['domain.url', '--processes', '2'])
+    assert result.exit_code == 0
+    assert mock_website_check.call_args.args[1].processes == 2
+    assert mock_website_check.call_args.kwargs["analyze_workers"] == 2
+
+
 def test_cli_invalid():
     runner = CliRunner()
     result = runner.invoke(main)
@@ -70,3 +199,12 @@ def test_cli_help():
     result = runner.invoke(main, ['-h'])
 
     assert result.exit_code == 0
+
+
+def test_cli_imports_no_heavy_dependencies():
+    heavy = ["bs4", "jinja2", "pandas", "PIL", "playwright", "requests"]
+    code = f"import sys, website_checker.cli; print([m for m in {heavy!r} if m in sys.modules])"
+
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+
+    assert result.stdout.strip() == "[]"
@@ -1,3 +1,4 @@
+from unittest import mock
 from unittest.mock import patch
 
 import pytest
@@ -6,6 +7,8 @@ from website_checker import main
 from website_checker.analyze.analyzer import Analyzer
 from website_checker.analyze.result import adapter
 from website_checker.crawl.crawler import Crawler
+from website_checker.crawl.recrawl import RecrawlCache
+from website_checker.crawl.websitepage import WebsitePage
 
 
 @pytest.fixture
@@ -21,3 +24,47 @@ def test_main(mock_crawler_next_once, mock_desktop_path):
     pdf_file, _, _ = main.run_full_analysis(url, analyzer, adapter)
 
     assert pdf_file.is_file()
+
+
+def test_evaluate_reuses_unchanged_pages(page, tmp_path):
+    recrawl = RecrawlCache(tmp_path / "recrawl.pickle")
+    first_run = main.evaluate(Analyzer(), [page], recrawl=recrawl)
+    recrawl.save()
+
+    analyzer = mock.Mock()
+    recrawl = RecrawlCache(tmp_path / "recrawl.pickle")
+    unchanged_page = WebsitePage(url=page.url, not_modified=True)  # not rendered by the crawler
+    second_run = main.evaluate(analyzer, [unchanged_page], recrawl=recrawl)
+
+    assert not analyzer.run_checks.called
+    assert [result.title for result in second_run[0].results] == [result.title for result in first_run[0].results]
+
+
+def test_run_full_analysis_streams_pages(page, mock_desktop_path):
+    second_page = WebsitePage(url="https://domain.test/second", title="Second", html=page.html)
+    events = []
+
+    def next_page():
+        for crawled in (page, second_page):
+            events.append(f"crawl {crawled.url}")
+            yield crawled
+
+    analyzer = mock.Mock()
+    analyzer.run_checks.side_effect = lambda p: events.append(f"analyze {p.url}") or mock.Mock(url=p.url)
+    with patch.object(main, "Browser"), patch.object(main, "report") as mock_report, patch.object(
+        Crawler, "next_page", side_effect=next_page()
+    ):
+        _, evaluations, crawled_pages = main.run_full_analysis(
+            "https://domain.test", analyzer, adapter, analyze_workers=0
+        )
+
+    assert events == [
+        "crawl https://domain.test",
+        "analyze https://domain.test",
+        "crawl https://domain.test/second",
+        "analyze https://domain.test/second",
+    ]
+    assert [evaluation.url for evaluation in evaluations] == [page.url, second_page.url]
+    assert mock_report.call_args.args[1] == evaluations
+    assert crawled_pages == []
+    assert page.html == "" and second_page.html == ""
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+import pytest
+
 from website_checker import utils
 
 
@@ -17,3 +19,43 @@ def test_datetime_str():
     datetime_str = utils.datetime_str(datetime(2021, 1, 1))
 
     assert datetime_str == expected_datetime_str
+
+
+@pytest.mark.parametrize(
+    "url, expected_url",
+    [
+        ("https://domain.test", "https://domain.test"),
+        ("https://domain.test/", "https://domain.test"),
+        ("https://domain.test/contact/", "https://domain.test/contact"),
+        ("HTTPS://Domain.TEST/Contact", "https://domain.test/Contact"),
+        ("https://domain.test:443/page", "https://domain.test/page"),
+        ("http://domain.test:80/page", "http://domain.test/page"),
+        ("http://domain.test:8000/page", "http://domain.test:8000/page"),
+        ("https://domain.test/page#fragment", "https://domain.test/page"),
+        ("https://domain.test/page?b=2&a=1", "https://domain.test/page?b=2&a=1"),
+    ],
+)
+def test_canonical_url(url, expected_url):
+    assert utils.canonical_url(url) == expected_url
+
+
+@pytest.mark.parametrize("url", ["http://localhost:PORT/x", "https://a.com:99999/"])
+def test_canonical_url_keeps_invalid_port(url):
+    assert utils.canonical_url(url) == url.lower().rstrip("/")
+
+
+def test_canonical_url_sorts_query():
+    url = "https://domain.test/page/?b=2&a=1&a=0"
+
+    assert utils.canonical_url(url, sort_query=True) == "https://domain.test/page?a=0&a=1&b=2"
+
+
+def test_url_index():
+    index = utils.UrlIndex(["https://domain.test/", "https://domain.test/contact"])
+    index.add("https://Domain.test/contact/#form")
+
+    assert len(index) == 2
+    assert "https://domain.test" in index
+    assert "https://domain.test:443/contact/" in index
+    assert "https://domain.test/about" not in index
+    assert None not in index
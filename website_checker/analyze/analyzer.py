@@ -1,39 +1,176 @@
-import glob
-from importlib.machinery import SourceFileLoader
-from pathlib import Path
-from typing import Any, Dict
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
 
 from website_checker.analyze.base_analyzer import BaseAnalyzer
-from website_checker.analyze.result import PageEvaluation
+from website_checker.analyze.result import PageEvaluation, Result
+from website_checker.analyze.visitor import VisitorAnalyzer, stream, traverse
+from website_checker.check import CHECKS
 from website_checker.crawl.websitepage import WebsitePage
 
-check_dir = Path(__file__).parent.parent / "check"
+ENTRY_POINT_GROUP = "website_checker.checks"
+
+_process_analyzer: Optional["Analyzer"] = None  # of a worker process
+
+
+def load_checks() -> Dict[str, Any]:
+    """Imports the shipped checks and those registered by other packages.
+
+    Direct subclasses of BaseAnalyzer, which are imported otherwise, are included.
+    """
+    checks = [_load(reference) for reference in CHECKS]
+    for entry_point in _entry_points(ENTRY_POINT_GROUP):
+        try:
+            check = entry_point.load()
+        except Exception as e:  # a broken plugin must not stop the analysis
+            logger.warning(f"Check {entry_point.name} not loaded: {e}")
+            continue
+        if isinstance(check, type) and issubclass(check, BaseAnalyzer):
+            checks.append(check)
+        else:
+            logger.warning(f"Check {entry_point.name} not loaded: {check!r} is no subclass of BaseAnalyzer")
+    checks.extend(cls for cls in BaseAnalyzer.__subclasses__() if cls is not VisitorAnalyzer)
+    return {cls.__name__: cls for cls in checks}
+
+
+def _load(reference: str):
+    module_name, _, attribute = reference.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
 
 
-def load_modules(package):
-    """Loads all modules in a package."""
-    for module in glob.glob(str(package / "**/*.py"), recursive=True):
-        stem = Path(module).stem
-        SourceFileLoader(stem, module).load_module()
+def _entry_points(group: str):
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])  # Python < 3.10
 
 
 class Analyzer:
+    """Runs all checks on a page.
+
+    With ``processes``, checks run in a pool of worker processes, so parsing
+    HTML scales across cores. Pages are sent without their images. The
+    workers are spawned, as forking the threads of a running crawl is unsafe,
+    and the pool starts when the analyzer is entered.
+
+    Checks are created once per thread and reset before each page.
+
+    Parameters
+    ----------
+    processes
+        Number of worker processes, 0 runs the checks in the calling thread.
+    """
+
     registry: Dict[str, Any] = {}
 
-    def __init__(self):
+    def __init__(self, processes=0):
         if not self.__class__.registry:
-            load_modules(check_dir)
-            classes = {cls.__name__: cls for cls in BaseAnalyzer.__subclasses__()}
-            self.__class__.registry = classes
+            self.__class__.registry = load_checks()
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()  # checks of a thread
 
-    def run_checks(self, page: WebsitePage):
+    def run_checks(self, page: WebsitePage) -> PageEvaluation:
         """Collects analyzer results for a single page."""
-        page_result = PageEvaluation(url=page.url, title=page.title, screenshot=page.screenshot)
-        for analyzer_class in self.__class__.registry.values():
-            result = analyzer_class().check(page)
+        if self.processes:
+            page_result = self._get_pool().submit(_run_checks_in_process, _payload(page)).result()
+            page_result.screenshot = page.screenshot
+            page_result.thumbnail = page.thumbnail
+            return page_result
+        return self._run_checks(page)
+
+    def run_checks_many(self, pages: Iterable[WebsitePage]) -> Iterator[PageEvaluation]:
+        """Collects analyzer results for many pages, in the order of the pages."""
+        if not self.processes:
+            yield from (self._run_checks(page) for page in pages)
+            return
+        pages = list(pages)
+        payloads = [_payload(page) for page in pages]
+        results = self._get_pool().map(_run_checks_in_process, payloads)
+        for page, page_result in zip(pages, results):
+            page_result.screenshot = page.screenshot
+            page_result.thumbnail = page.thumbnail
+            yield page_result
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=True)
+
+    def _run_checks(self, page: WebsitePage) -> PageEvaluation:
+        page_result = PageEvaluation(
+            url=page.url, title=page.title, screenshot=page.screenshot, thumbnail=page.thumbnail
+        )
+        checks = self._checks()
+        for check in checks:
+            check.reset()
+        visitors = [check for check in checks if isinstance(check, VisitorAnalyzer)]
+        stream(page, [visitor for visitor in visitors if visitor.streaming])  # without a tree
+        traverse(page, [visitor for visitor in visitors if not visitor.streaming])  # a single pass over the tree
+        for check in checks:
+            result = check.finish(page) if isinstance(check, VisitorAnalyzer) else check.check(page)
             if result:
                 if not result.hidden:
-                    page_result.add_result(result)
+                    page_result.add_result(_to_result(result))
                 if result.tags:
                     page_result.set_tags(result.tags)
         return page_result
+
+    def _checks(self) -> List[BaseAnalyzer]:
+        checks = getattr(self._local, "checks", None)
+        if checks is None:
+            checks = self._local.checks = [analyzer_class() for analyzer_class in self.__class__.registry.values()]
+        return checks
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process,
+                )
+            return self._pool
+
+    def __enter__(self):
+        if self.processes:
+            self._get_pool()  # before crawler threads start
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _to_result(check: BaseAnalyzer) -> Result:
+    """Keeps only the results of a check, which pickle without the loaded check modules."""
+    return Result(title=check.title, description=check.description, result=check.result, status=check.status)
+
+
+def _payload(page: WebsitePage) -> WebsitePage:
+    """Returns a copy of a page with the data needed by the checks."""
+    return WebsitePage(
+        url=page.url,
+        title=page.title,
+        html=page.html,
+        cookies=page.cookies,
+        elements=page.elements,
+        requests=page.requests,
+        failed_requests=page.failed_requests,
+        headers=page.headers,
+    )
+
+
+def _init_process():
+    global _process_analyzer
+    _process_analyzer = Analyzer()
+
+
+def _run_checks_in_process(page: WebsitePage) -> PageEvaluation:
+    return _process_analyzer.run_checks(page)
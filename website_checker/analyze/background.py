@@ -0,0 +1,67 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Optional, Tuple
+
+from website_checker.analyze.result import PageEvaluation
+from website_checker.crawl.websitepage import WebsitePage
+
+
+class BackgroundAnalyzer:
+    """Analyzes pages in worker threads, while the crawler loads the next pages.
+
+    At most ``max_pending`` pages wait for their analysis, the crawl is paused
+    until a worker catches up. The first error of an analysis stops the crawl,
+    pending analyses are cancelled.
+
+    Parameters
+    ----------
+    evaluate
+        Analyzes a single page.
+    workers
+        Number of analyzer threads.
+    max_pending
+        Number of crawled pages, which may wait for their analysis.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[WebsitePage], PageEvaluation],
+        workers: int = 1,
+        max_pending: Optional[int] = None,
+    ):
+        self._evaluate = evaluate
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending or 2 * self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analyzer")
+        self._pending: Deque[Tuple[WebsitePage, Future]] = deque()
+
+    def map(self, pages: Iterable[WebsitePage]) -> Iterator[Tuple[WebsitePage, PageEvaluation]]:
+        """Yields each page with its evaluation in the order of the pages."""
+        try:
+            for page in pages:
+                self._pending.append((page, self._executor.submit(self._evaluate, page)))
+                while self._pending and (self._pending[0][1].done() or len(self._pending) >= self.max_pending):
+                    yield self._next_result()
+            while self._pending:
+                yield self._next_result()
+        finally:
+            self._cancel()
+
+    def close(self):
+        self._cancel()
+        self._executor.shutdown(wait=True)
+
+    def _next_result(self) -> Tuple[WebsitePage, PageEvaluation]:
+        page, future = self._pending.popleft()
+        return page, future.result()
+
+    def _cancel(self):
+        while self._pending:
+            _, future = self._pending.popleft()
+            future.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -8,6 +8,10 @@ class BaseAnalyzer:
         self.hidden = hidden
         self.title = None
         self.description = None  # Text or HTML
+        self.reset()
+
+    def reset(self):
+        """Forgets the results of the last page, so the check can be reused for the next one."""
         self.result = None
         self.status = None
         self.tags = []
@@ -5,6 +5,7 @@ from typing import Any, List
 
 from website_checker.analyze.result_data import StatusSummary, TestDescription
 from website_checker.report.report_data import ReportData
+from website_checker.utils import canonical_url, image_mime_type
 
 
 class Status(IntEnum):
@@ -27,7 +28,7 @@ class Result:
 class PageEvaluation:
     """Represents the analyzer results for a single URL."""
 
-    def __init__(self, url: str, title: str, results=None, screenshot: Any = None):
+    def __init__(self, url: str, title: str, results=None, screenshot: Any = None, thumbnail: Any = None):
         if results is None:
             results = []
         self.url = url
@@ -36,6 +37,11 @@ class PageEvaluation:
         self.status = None  # worst status of all results
         self.tags: List[str] = []
         self.screenshot = screenshot
+        self.thumbnail = thumbnail  # shown in the sitemap of the report
+
+    def __setstate__(self, state):
+        state.setdefault("thumbnail", None)  # pickled by an older version
+        self.__dict__.update(state)
 
     def add_result(self, evaluation: Result):
         self.results.append(evaluation)
@@ -72,14 +78,20 @@ def adapter(eval_pages: List[PageEvaluation]) -> ReportData:
         pages=eval_pages,
         descriptions=descriptions,
     )
-    if first_page.screenshot:
-        screenshot_bytes = base64.b64encode(first_page.screenshot).decode()
-        report_data.screenshot = screenshot_bytes
+    screenshot = next((page.screenshot for page in eval_pages if page.screenshot), None)
+    if screenshot:
+        report_data.screenshot = base64.b64encode(screenshot).decode()
+        report_data.screenshot_type = image_mime_type(screenshot)
+    report_data.thumbnails = {page.url: _data_uri(page.thumbnail) for page in eval_pages if page.thumbnail}
     if common_tags:
         report_data.tags = common_tags
     return report_data
 
 
+def _data_uri(image: bytes) -> str:
+    return f"data:{image_mime_type(image)};base64,{base64.b64encode(image).decode()}"
+
+
 def collect_test_descriptions(evaluated_pages: List[PageEvaluation]) -> List[TestDescription]:
     """Returns unique tests and their descriptions."""
     descriptions = {}
@@ -123,4 +135,4 @@ def sort_by_url(objects: list):
 
     Any object with a url attribute can be used.
     """
-    return sorted(objects, key=lambda page: (page.url.rstrip("/"), page))
+    return sorted(objects, key=lambda page: (canonical_url(page.url), page))
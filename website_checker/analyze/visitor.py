@@ -0,0 +1,212 @@
+from collections import deque
+from html.parser import HTMLParser
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bs4 import Tag
+
+from website_checker.analyze.base_analyzer import BaseAnalyzer
+
+CHUNK_SIZE = 64 * 1024  # characters tokenized before checking for an early exit
+
+VOID_ELEMENTS = frozenset(
+    ["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"]
+)
+
+
+class VisitorAnalyzer(BaseAnalyzer):
+    """Check which reads the elements of a page during a single shared traversal.
+
+    A check declares the elements it is interested in. ``traverse`` walks the
+    document once for all checks and passes each matching element to ``visit``.
+
+    Attributes
+    ----------
+    visit_tags
+        Names of elements, e.g. ``("h1", "h2")``.
+    visit_attributes
+        Elements which have one of these attributes.
+    visit_class_prefixes
+        Elements whose class attribute starts with a prefix, like the CSS selector ``[class^='prefix']``.
+    visit_text
+        Whether ``visit`` reads the text of an element.
+    streaming
+        Whether the check only reads the name, attributes and text of visited elements.
+        Such checks are fed by ``stream`` without building a tree of the document.
+    """
+
+    visit_tags: Tuple[str, ...] = ()
+    visit_attributes: Tuple[str, ...] = ()
+    visit_class_prefixes: Tuple[str, ...] = ()
+    visit_text = False
+    streaming = False
+
+    def start(self, page):
+        """Prepares the check for a page before the traversal."""
+
+    def visit(self, element: Tag) -> bool:
+        """Reads a matching element, returns True when no more elements are needed."""
+        raise NotImplementedError
+
+    def finish(self, page) -> BaseAnalyzer:
+        """Sets the results after the traversal."""
+        raise NotImplementedError
+
+    def check(self, page) -> BaseAnalyzer:
+        if self.streaming:
+            stream(page, [self])
+        else:
+            traverse(page, [self])
+        return self.finish(page)
+
+
+class StreamElement:
+    """Element of a streamed document, which offers the parts of a bs4 Tag read by checks."""
+
+    __slots__ = ("name", "attrs", "complete", "_text")
+
+    def __init__(self, name: str, attrs: Dict[str, object], complete=True):
+        self.name = name
+        self.attrs = attrs
+        self.complete = complete  # text is read until the end tag
+        self._text: List[str] = []
+
+    def get(self, key: str, default=None):
+        return self.attrs.get(key, default)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text)
+
+    def __repr__(self):
+        return f"StreamElement({self.name!r}, {self.attrs!r})"
+
+
+class _Dispatcher:
+    """Finds the checks interested in an element and passes it on."""
+
+    def __init__(self, page, visitors: Sequence[VisitorAnalyzer]):
+        self.by_tag: Dict[str, List[VisitorAnalyzer]] = {}
+        self.by_attribute: Dict[str, List[VisitorAnalyzer]] = {}
+        self.by_class_prefix: List[Tuple[str, VisitorAnalyzer]] = []
+        for visitor in visitors:
+            visitor.start(page)
+            for tag in visitor.visit_tags:
+                self.by_tag.setdefault(tag, []).append(visitor)
+            for attribute in visitor.visit_attributes:
+                self.by_attribute.setdefault(attribute, []).append(visitor)
+            for prefix in visitor.visit_class_prefixes:
+                self.by_class_prefix.append((prefix, visitor))
+        self.active = set(visitors)
+
+    @property
+    def interested(self) -> bool:
+        return bool(self.by_tag or self.by_attribute or self.by_class_prefix)
+
+    def receivers(self, name: str, attributes: Iterable[str], classes) -> List[VisitorAnalyzer]:
+        receivers = list(self.by_tag.get(name, ()))
+        if self.by_attribute:
+            for attribute in attributes:
+                receivers.extend(self.by_attribute.get(attribute, ()))
+        if self.by_class_prefix and classes:
+            first_class = classes[0]
+            receivers.extend(visitor for prefix, visitor in self.by_class_prefix if first_class.startswith(prefix))
+        return receivers
+
+    def dispatch(self, element, receivers: List[VisitorAnalyzer]) -> bool:
+        """Passes an element to its checks, returns True when all checks are done."""
+        for visitor in dict.fromkeys(receivers):  # each visitor sees an element once
+            if visitor in self.active and visitor.visit(element):
+                self.active.discard(visitor)
+                if not self.active:
+                    return True
+        return False
+
+
+def traverse(page, visitors: Sequence[VisitorAnalyzer]):
+    """Walks the parsed document of a page once and dispatches elements to the interested checks.
+
+    The traversal ends early, when all checks have seen enough.
+    """
+    dispatcher = _Dispatcher(page, visitors)
+    if not dispatcher.interested:
+        return
+    for element in page.soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        receivers = dispatcher.receivers(element.name, element.attrs, element.get("class"))
+        if receivers and dispatcher.dispatch(element, receivers):
+            return
+
+
+def stream(page, visitors: Sequence[VisitorAnalyzer], chunk_size: int = CHUNK_SIZE):
+    """Tokenizes the HTML of a page in chunks and dispatches elements to the interested checks.
+
+    No tree is built, only elements whose text is read are kept until their end
+    tag. Tokenizing stops as soon as all checks have seen enough, so an early
+    finding skips the rest of the document.
+    """
+    dispatcher = _Dispatcher(page, visitors)
+    if not dispatcher.interested:
+        return
+    parser = _StreamParser(dispatcher)
+    html = page.html or ""
+    try:
+        for offset in range(0, len(html), chunk_size):
+            parser.feed(html[offset : offset + chunk_size])
+        parser.close()
+        parser.flush(end=True)
+    except _StopStream:
+        pass
+
+
+class _StopStream(Exception):
+    """All checks have seen enough of the document."""
+
+
+class _StreamParser(HTMLParser):
+    """Passes elements to checks in document order while tokenizing."""
+
+    def __init__(self, dispatcher: _Dispatcher):
+        super().__init__(convert_charrefs=True)
+        self.dispatcher = dispatcher
+        self.pending: Deque[Tuple[StreamElement, List[VisitorAnalyzer]]] = deque()
+        self.reading: List[StreamElement] = []  # elements collecting their text
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, closed=tag in VOID_ELEMENTS)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, closed=True)
+
+    def handle_endtag(self, tag):
+        for idx in range(len(self.reading) - 1, -1, -1):
+            if self.reading[idx].name == tag:
+                self.reading.pop(idx).complete = True
+                self.flush()
+                return
+
+    def handle_data(self, data):
+        for element in self.reading:
+            element._text.append(data)
+
+    def flush(self, end=False):
+        """Dispatches the pending elements whose text is complete."""
+        while self.pending and (end or self.pending[0][0].complete):
+            element, receivers = self.pending.popleft()
+            if self.dispatcher.dispatch(element, receivers):
+                raise _StopStream
+
+    def _start(self, tag: str, attrs, closed: bool):
+        attributes: Dict[str, object] = {name: value or "" for name, value in attrs}
+        classes: Optional[List[str]] = None
+        if "class" in attributes:
+            classes = attributes["class"] = str(attributes["class"]).split()  # multi-valued like in bs4
+        receivers = self.dispatcher.receivers(tag, attributes, classes)
+        if not receivers:
+            return
+        reads_text = not closed and any(visitor.visit_text for visitor in receivers)
+        element = StreamElement(tag, attributes, complete=not reads_text)
+        if reads_text:
+            self.reading.append(element)
+        self.pending.append((element, receivers))
+        self.flush()
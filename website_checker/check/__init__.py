@@ -0,0 +1,15 @@
+"""Checks shipped with the website checker.
+
+Checks of other packages register under the entry point group
+``website_checker.checks``.
+"""
+
+CHECKS = [
+    "website_checker.check.cookies:CheckCookies",
+    "website_checker.check.detect_page_builder:DetectCMSPageBuilder",
+    "website_checker.check.external_network_access:CheckExternalNetworkAccess",
+    "website_checker.check.heading_structure:CheckHeadingStructure",
+    "website_checker.check.resource_load_errors:CheckResourceLoadErrors",
+    "website_checker.check.resource_size:CheckResourceSize",
+    "website_checker.check.semantic_html:CheckSemanticHtml",
+]  # module:class, imported when the first analyzer is created
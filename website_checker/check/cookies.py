@@ -18,11 +18,9 @@ class CheckCookies(BaseAnalyzer):
         )
         cookies = []
         with CookieDatabase() as cookie_db:
+            found = cookie_db.search_many(cookie.name for cookie in page.cookies)
             for cookie in page.cookies:
-                try:
-                    result = cookie_db.search(cookie.name)
-                except KeyError:
-                    result = {"cookie_name": cookie.name}
+                result = found.get(cookie.name, {"cookie_name": cookie.name})
                 cookie_details = {key: result[key] for key in sorted_keys if key in result}
                 cookies.append(cookie_details)
 
@@ -1,36 +1,211 @@
+import hashlib
+import math
+import os
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
 
-import pandas as pd
 import requests
 from loguru import logger
 
 current_path = Path(__file__).parent
 COOKIE_DB_CSV = current_path / "csv" / "open-cookie-database.csv"
 
+HEADER_NAMES = [
+    "id",
+    "platform",
+    "category",
+    "cookie_name",
+    "domain",
+    "description",
+    "retention_period",
+    "data_controller",
+    "privacy_policy",
+    "wildcard_match",
+]
+MMAP_SIZE = 64 * 1024 * 1024  # bytes of the compiled database mapped into memory
+
+
+class PrefixIndex:
+    """Finds the longest key, which is a prefix of a name, in O(len(name)).
+
+    The index is a trie of nested dicts, which is not changed after creation.
+    """
+
+    _KEY = ""  # marks the end of a key, nodes of characters are never empty
+
+    def __init__(self, keys: Iterable[str]):
+        self._root: dict = {}
+        for key in keys:
+            node = self._root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[self._KEY] = key
+
+    def longest_prefix(self, name: str) -> Optional[str]:
+        node = self._root
+        found = node.get(self._KEY)
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(self._KEY, found)
+        return found
+
+
+_cache: Dict[str, Tuple[Tuple[int, int], Mapping[str, Mapping], PrefixIndex]] = {}  # file: (stamp, data, index)
+_cache_lock = threading.Lock()
+
+
+def load_cookie_data(file=COOKIE_DB_CSV) -> Tuple[Mapping[str, Mapping], PrefixIndex]:
+    """Returns the read-only cookie data of a CSV file and an index of its wildcard cookies.
+
+    The data is read from the compiled database next to the CSV file, which is
+    compiled again when it is stale. Both are loaded once per process, shared
+    by all threads and loaded again, when the file changed.
+    """
+    stat = os.stat(file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(str(file))
+        if cached is None or cached[0] != stamp:
+            connection = _open_compiled(file)
+            if connection:
+                data: Mapping[str, Mapping] = CompiledCookieData(connection)
+                names = connection.execute("SELECT cookie_name FROM cookies WHERE wildcard_match = 1")
+                wildcards = PrefixIndex(name for (name,) in names)
+            else:  # not writable
+                csv_data = CookieDatabase(file).load_from_csv()
+                data = MappingProxyType({name: MappingProxyType(details) for name, details in csv_data.items()})
+                wildcards = PrefixIndex(name for name, details in csv_data.items() if is_wildcard(details))
+            cached = _cache[str(file)] = (stamp, data, wildcards)
+        return cached[1], cached[2]
+
+
+def compiled_path(file=COOKIE_DB_CSV) -> Path:
+    return Path(file).with_suffix(".sqlite")
+
+
+def compile_database(file=COOKIE_DB_CSV) -> Path:
+    """Writes the cookie data of a CSV file to an indexed SQLite database next to it.
+
+    The CSV file stays the source, the database remembers its hash to detect
+    when it is stale.
+    """
+    target = compiled_path(file)
+    data = CookieDatabase(file).load_from_csv()
+    columns = ", ".join(HEADER_NAMES)
+    placeholders = ", ".join("?" for _ in HEADER_NAMES)
+    fd, temp_name = tempfile.mkstemp(suffix=".sqlite", dir=target.parent)
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(temp_name)
+        with connection:
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            connection.execute(f"CREATE TABLE cookies ({columns}, PRIMARY KEY (cookie_name)) WITHOUT ROWID")
+            connection.execute("CREATE INDEX wildcards ON cookies (wildcard_match)")
+            connection.executemany(
+                f"INSERT INTO cookies ({columns}) VALUES ({placeholders})",
+                ([_to_sql(details[name]) for name in HEADER_NAMES] for details in data.values()),
+            )
+            connection.execute("INSERT INTO meta VALUES ('source_sha256', ?)", (_sha256(file),))
+        connection.close()
+        os.replace(temp_name, target)  # readers never see a partial database
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+    return target
+
+
+class CompiledCookieData(Mapping):
+    """Read-only cookie data of a compiled database, which is queried per cookie."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def __getitem__(self, cookie_name: str) -> Mapping:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM cookies WHERE cookie_name = ?", (cookie_name,)).fetchone()
+        if row is None:
+            raise KeyError(cookie_name)
+        return MappingProxyType(dict(row))
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            names = self._connection.execute("SELECT cookie_name FROM cookies").fetchall()
+        return (name for (name,) in names)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM cookies").fetchone()[0]
+
+
+def _open_compiled(file) -> Optional[sqlite3.Connection]:
+    """Opens the compiled database read-only, after compiling it when it is missing or stale."""
+    target = compiled_path(file)
+    digest = _sha256(file)
+    try:
+        if target.exists():
+            connection = _connect(target)
+            row = connection.execute("SELECT value FROM meta WHERE key = 'source_sha256'").fetchone()
+            if row and row[0] == digest:
+                return connection
+            connection.close()
+        logger.info(f"Compiling cookie database '{target}'.")
+        compile_database(file)
+        return _connect(target)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Could not use compiled cookie database '{target}', loading CSV instead: {e}")
+        return None
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    return connection
+
+
+def _sha256(file) -> str:
+    with open(file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _to_sql(value):
+    """Converts values of pandas to SQLite types, missing values to NULL."""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+
+def is_wildcard(cookie_details: Mapping) -> bool:
+    """Whether the name of a cookie is the prefix of cookie names."""
+    try:
+        return bool(int(cookie_details["wildcard_match"]))
+    except (TypeError, ValueError):  # not set
+        return False
+
 
 class CookieDatabase:
     def __init__(self, file=COOKIE_DB_CSV):
         self.file = file
         self.data = None
+        self.wildcards = PrefixIndex([])
 
     def load_from_csv(self) -> dict:
         """Returns a hashtable with cookie data.
 
         The key is the cookie name and the values contain the cookie data.
         """
-        header_names = [
-            "id",
-            "platform",
-            "category",
-            "cookie_name",
-            "domain",
-            "description",
-            "retention_period",
-            "data_controller",
-            "privacy_policy",
-            "wildcard_match",
-        ]
+        import pandas as pd  # only needed to compile the database
+
+        header_names = HEADER_NAMES
         index_col = header_names[3]
         df = pd.read_csv(self.file)
         df.columns = pd.Index(header_names)
@@ -38,32 +213,36 @@ class CookieDatabase:
         unique_cookies = df_with_index.drop_duplicates(index_col)
         return unique_cookies.to_dict(orient="index")
 
-    def search(self, cookie_name):
-        cookie_details = self.data.get(cookie_name, None)
+    def search(self, cookie_name) -> dict:
+        """Returns a copy of the details of a cookie, which may be changed.
 
-        found_name = ""
-        if cookie_details and int(cookie_details["wildcard_match"]):
-            found_name = cookie_details["cookie_name"]
-
-        if cookie_details is None or cookie_details["wildcard_match"]:
-            part_name = found_name
-            for name, details in self.data.items():
-                if details["wildcard_match"] and cookie_name.startswith(name):
-                    if len(found_name) < len(name):
-                        found_name = name
-
-            if not found_name or found_name == part_name:
+        A wildcard cookie matches names, which start with its name and are longer.
+        """
+        cookie_details = self.data.get(cookie_name, None)
+        if cookie_details is not None:
+            if is_wildcard(cookie_details):  # the name alone is not a match
                 raise KeyError(f"Could not find details for cookie '{cookie_name}' in database.")
+            return dict(cookie_details)
 
-            cookie_details = self.data[found_name]
-            cookie_details["cookie_name"] = cookie_name
+        found_name = self.wildcards.longest_prefix(cookie_name)
+        if found_name is None:
+            raise KeyError(f"Could not find details for cookie '{cookie_name}' in database.")
+        return dict(self.data[found_name], cookie_name=cookie_name)
 
-        return cookie_details
+    def search_many(self, cookie_names: Iterable[str]) -> Dict[str, dict]:
+        """Returns the details of all found cookies by their name."""
+        found = {}
+        for cookie_name in cookie_names:
+            try:
+                found[cookie_name] = self.search(cookie_name)
+            except KeyError:
+                pass
+        return found
 
     def __enter__(self):
         self.data = {}
         try:
-            self.data = self.load_from_csv()
+            self.data, self.wildcards = load_cookie_data(self.file)
         except FileNotFoundError:
             logger.error(f"Could not find cookie database '{self.file}'.")
         return self
@@ -112,6 +291,7 @@ def update_database(url=None):
 
         check_compatibility(temp_file.name)
         write_to_file(csv_binary, COOKIE_DB_CSV)  # update CSV
+    compile_database(COOKIE_DB_CSV)
     print(f"Cookie database '{COOKIE_DB_CSV}' updated successfully.")
 
 
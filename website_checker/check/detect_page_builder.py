@@ -1,63 +1,62 @@
 import re
 
-from bs4 import BeautifulSoup
-
-from website_checker.analyze import base_analyzer
+from website_checker.analyze.visitor import VisitorAnalyzer
 
 DETECTED_CLASSES = {
-    "Beaver Builder": "[class^='fl-']",
-    "Bricks": "[class^='brxe-']",
-    "Divi": "[class^='et_pb_']",
-    "Elementor": "[class^='elementor-']",
-    "Jimdo": "[class^='jmd-']",
-    "Oxygen Builder": "[class^='ct-']",
-    "SquareSpace": "[class^='sqs-']",
-    "Visual Composer": "[class^='vc_']",
-}
-
+    "Beaver Builder": "fl-",
+    "Bricks": "brxe-",
+    "Divi": "et_pb_",
+    "Elementor": "elementor-",
+    "Jimdo": "jmd-",
+    "Oxygen Builder": "ct-",
+    "SquareSpace": "sqs-",
+    "Visual Composer": "vc_",
+}  # prefixes of the class attribute
+
+
+class DetectCMSPageBuilder(VisitorAnalyzer):
+    visit_tags = ("meta",)
+    visit_class_prefixes = tuple(DETECTED_CLASSES.values())
+    streaming = True
 
-class DetectCMSPageBuilder(base_analyzer.BaseAnalyzer):
     def __init__(self):
         super().__init__(hidden=True)
 
-    def check(self, page):
+    def start(self, page):
+        self.generators = []
+        self.found_classes = dict.fromkeys(DETECTED_CLASSES, 0)
+
+    def visit(self, element):
+        if element.name == "meta" and re.search(r"generator", element.get("name", ""), re.I):
+            self.generators.append(element.get("content") or "")
+        classes = element.get("class")
+        if classes:
+            for builder_name, prefix in DETECTED_CLASSES.items():
+                if classes[0].startswith(prefix):
+                    self.found_classes[builder_name] += 1
+        return False
+
+    def finish(self, page):
         self.title = "Detect CMS and Page Builder"
-        soup = BeautifulSoup(page.html, "html.parser")
 
-        if any(
-            re.search(r"WordPress \d+", element.get("content"))
-            for element in soup.find_all("meta", attrs={"name": re.compile(r"generator", re.I)})
-        ):
+        if any(re.search(r"WordPress \d+", content) for content in self.generators):
             self.add_tags("WordPress")
         elif any("/wp-content/" in element.url for element in page.elements):
             self.add_tags("WordPress")
-        elif any(
-            "TYPO3 CMS" == element.get("content")
-            for element in soup.find_all("meta", attrs={"name": re.compile(r"generator", re.I)})
-        ):
+        elif any("TYPO3 CMS" == content for content in self.generators):
             self.add_tags("TYPO3")
         elif any("/typo3" in element.url for element in page.elements):
             self.add_tags("TYPO3")
-        elif any(
-            re.search(r"Drupal \d+ \(https://www.drupal.org\)", element.get("content"))
-            for element in soup.find_all("meta", attrs={"name": re.compile(r"generator", re.I)})
-        ):
+        elif any(re.search(r"Drupal \d+ \(https://www.drupal.org\)", content) for content in self.generators):
             self.add_tags("Drupal")
         elif any("/sites/default/files/" in element.url for element in page.elements):
             self.add_tags("Drupal")
         elif any("/shopifycloud/shopify/assets/" in element.url for element in page.elements):
             self.add_tags("Shopify")
-        elif any(
-            "Joomla! - Open Source Content Management" == element.get("content")
-            for element in soup.find_all("meta", attrs={"name": re.compile(r"generator", re.I)})
-        ):
+        elif any("Joomla! - Open Source Content Management" == content for content in self.generators):
             self.add_tags("Joomla")
 
-        result = {}
-        for builder_name, selector in DETECTED_CLASSES.items():
-            found_classes = len(soup.select(selector))
-            if found_classes:
-                result[builder_name] = found_classes
+        result = {name: count for name, count in self.found_classes.items() if count}
         if result:
             selected_name = max(result, key=result.get)
             self.add_tags(selected_name)
@@ -3,6 +3,7 @@ from urllib.parse import ParseResult, urlparse
 
 from website_checker.analyze import base_analyzer
 from website_checker.analyze.result import Status
+from website_checker.utils import canonical_url
 
 
 def is_internal_link(url: str, domain: str, allow_subdomain=True) -> bool:
@@ -42,14 +43,14 @@ class CheckExternalNetworkAccess(base_analyzer.BaseAnalyzer):
         self.title = "External network access"
         self.description = "Searches for network access to external servers."
 
-        domain = get_base_domain(page.url)
+        domain = canonical_url(get_base_domain(page.url))
 
         external_resources = []
         for resource in page.failed_requests:
-            if not is_internal_link(resource.url, domain):
+            if not is_internal_link(canonical_url(resource.url), domain):
                 external_resources.append(f"{resource.url}")
         for resource in page.elements:
-            if not is_internal_link(resource.url, domain):
+            if not is_internal_link(canonical_url(resource.url), domain):
                 external_resources.append(resource.url)
 
         if external_resources:
@@ -1,10 +1,7 @@
-import re
 from typing import List, Optional
 
-from bs4 import BeautifulSoup
-
-from website_checker.analyze.base_analyzer import BaseAnalyzer
 from website_checker.analyze.result import Status
+from website_checker.analyze.visitor import VisitorAnalyzer
 
 
 def next_allowed_heading(heading: Optional[str] = None) -> List[str]:
@@ -30,37 +27,42 @@ def shorten(text: str, length: int = 50) -> str:
     return (text[:length] + "..") if len(text) > length else text
 
 
-class CheckHeadingStructure(BaseAnalyzer):
-    def check(self, page):
-        self.title = "Heading structure"
-        self.description = "Checks whether the heading structure is valid."
+class CheckHeadingStructure(VisitorAnalyzer):
+    visit_tags = ("h1", "h2", "h3", "h4", "h5", "h6")
+    visit_text = True
+    streaming = True
 
-        soup = BeautifulSoup(page.html, "html.parser")
-        page_headings = soup.find_all(re.compile("^h[1-6]$"))
+    def start(self, page):
+        self.checked_headings = []
+        self.last_heading = None
 
-        checked_headings = []
-        last_heading = None
-        for heading in page_headings:
-            heading_level = heading.name
-            checked_headings.append(f"&lt;{heading_level}&gt; {shorten(heading.text)}")
+    def visit(self, heading):
+        """Stops at the first heading in an invalid order."""
+        heading_level = heading.name
+        self.checked_headings.append(f"&lt;{heading_level}&gt; {shorten(heading.text)}")
 
-            next_expected = next_allowed_heading(last_heading)
-            if heading_level not in next_expected:
-                status = Status.WARNING
-                self.save_result(
-                    (
-                        f"Heading '{shorten(heading.text)}' found as {heading_level}, "
-                        f"but expected one of {', '.join(next_expected)}."
-                    ),
-                    status,
-                )
+        next_expected = next_allowed_heading(self.last_heading)
+        if heading_level not in next_expected:
+            status = Status.WARNING
+            self.save_result(
+                (
+                    f"Heading '{shorten(heading.text)}' found as {heading_level}, "
+                    f"but expected one of {', '.join(next_expected)}."
+                ),
+                status,
+            )
 
-                self.save_result(checked_headings, status)
-                break
-            last_heading = heading.name
+            self.save_result(self.checked_headings, status)
+            return True
+        self.last_heading = heading_level
+        return False
+
+    def finish(self, page):
+        self.title = "Heading structure"
+        self.description = "Checks whether the heading structure is valid."
 
         if self.result is None:
-            if checked_headings:
+            if self.checked_headings:
                 self.save_result("Great, the heading structure is perfect.", Status.OK)
             else:
                 self.save_result("No heading found.", Status.WARNING)
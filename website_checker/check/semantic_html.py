@@ -1,21 +1,27 @@
 from collections import Counter
 
-from bs4 import BeautifulSoup
-
-from website_checker.analyze import base_analyzer
 from website_checker.analyze.result import Status
+from website_checker.analyze.visitor import VisitorAnalyzer
 
 STRUCTURAL_SEMANTIC_TAGS = ["header", "nav", "main", "section", "article", "aside", "footer"]
 
 
-class CheckSemanticHtml(base_analyzer.BaseAnalyzer):
-    def check(self, page):
+class CheckSemanticHtml(VisitorAnalyzer):
+    visit_tags = tuple(STRUCTURAL_SEMANTIC_TAGS)
+    streaming = True
+
+    def start(self, page):
+        self.found_tags = []
+
+    def visit(self, element):
+        self.found_tags.append(element.name)
+        return False
+
+    def finish(self, page):
         self.title = "Semantic HTML tags"
         self.description = "Checks usage of structural semantic HTML tags, which are good for accessibility and SEO."
 
-        soup = BeautifulSoup(page.html, "html.parser")
-        found_tags = [element.name for element in soup.find_all(STRUCTURAL_SEMANTIC_TAGS)]
-
+        found_tags = self.found_tags
         c = Counter(found_tags)
         tags_with_count = ", ".join([f"{tag} ({count})" for tag, count in c.items()])
 
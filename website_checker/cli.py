@@ -1,19 +1,154 @@
+from pathlib import Path
+
 import click
 from loguru import logger
 
-from website_checker.analyze.analyzer import Analyzer
-from website_checker.analyze.result import adapter
-from website_checker.main import run_full_analysis
+from website_checker.crawl.interception import ABORT, STUB
+from website_checker.crawl.screenshot import (
+    FIRST,
+    FORMATS,
+    JPEG,
+    MODES,
+    ScreenshotPolicy,
+)
+from website_checker.crawl.settle import NETWORK_IDLE, SETTLE_STRATEGIES
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
 
+def parse_viewport(ctx, param, value):
+    """Converts WIDTHxHEIGHT to the viewport of Playwright."""
+    if value is None:
+        return None
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise click.BadParameter("expected WIDTHxHEIGHT, e.g. 1280x720")
+    return {"width": width, "height": height}
+
+
+def parse_clip(ctx, param, value):
+    """Converts X,Y,WIDTH,HEIGHT to the clip area of Playwright."""
+    if value is None:
+        return None
+    try:
+        x, y, width, height = (float(part) for part in value.split(","))
+    except ValueError:
+        raise click.BadParameter("expected X,Y,WIDTH,HEIGHT, e.g. 0,0,1280,720")
+    return {"x": x, "y": y, "width": width, "height": height}
+
+
 @click.command(context_settings=CONTEXT_SETTINGS)
 @click.argument("url")
 @click.option("-r", "--rate-limit", default=0, type=int, help="Limit crawler to n milliseconds per page")
 @click.option("-p", "--max-pages", type=int, help="Crawl a maximum of n pages")
 @click.option("-s", "--save", is_flag=True, help="Save the crawled pages to a file")
-def main(url, rate_limit, max_pages, save):
+@click.option("-w", "--workers", default=1, type=click.IntRange(min=1), help="Crawl n pages concurrently")
+@click.option(
+    "--state-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Store the crawl progress in a directory",
+)
+@click.option("--resume", is_flag=True, help="Continue the crawl stored in the state directory")
+@click.option("--sitemap", is_flag=True, help="Queue all pages of the sitemaps before crawling")
+@click.option(
+    "--incremental",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Reuse results of pages, which are unchanged since the run stored in this file",
+)
+@click.option(
+    "--lean",
+    type=click.Choice([STUB, ABORT]),
+    is_flag=False,
+    flag_value=STUB,
+    help="Load only metadata of images, media and fonts, their bodies are stubbed or aborted",
+)
+@click.option(
+    "--settle",
+    type=click.Choice(list(SETTLE_STRATEGIES)),
+    default=NETWORK_IDLE,
+    help="Wait for network idle or for the DOM and a short quiet window",
+)
+@click.option(
+    "--screenshots",
+    type=click.Choice(MODES),
+    default=FIRST,
+    help="Take screenshots of no, the first, every n-th or all pages",
+)
+@click.option(
+    "--screenshot-every",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Take a screenshot of every n-th page, when sampled",
+)
+@click.option("--screenshot-format", type=click.Choice(FORMATS), default=JPEG, help="Image format of screenshots")
+@click.option(
+    "--screenshot-quality",
+    default=80,
+    type=click.IntRange(0, 100),
+    help="Quality of JPEG and WebP screenshots",
+)
+@click.option("--viewport", callback=parse_viewport, metavar="WIDTHxHEIGHT", help="Size of the browser window")
+@click.option(
+    "--screenshot-clip",
+    callback=parse_clip,
+    metavar="X,Y,WIDTH,HEIGHT",
+    help="Capture only this area of a page",
+)
+@click.option(
+    "--thumbnail-width",
+    type=click.IntRange(min=1),
+    help="Show thumbnails of this width in the sitemap of the report, requires Pillow",
+)
+@click.option(
+    "-a",
+    "--analyze-workers",
+    default=1,
+    type=click.IntRange(min=0),
+    help="Analyze pages in n threads while crawling, 0 analyzes between page loads",
+)
+@click.option(
+    "--processes",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Run checks in n processes to use several CPU cores",
+)
+def main(
+    url,
+    rate_limit,
+    max_pages,
+    save,
+    workers,
+    state_dir,
+    resume,
+    sitemap,
+    incremental,
+    lean,
+    settle,
+    screenshots,
+    screenshot_every,
+    screenshot_format,
+    screenshot_quality,
+    viewport,
+    screenshot_clip,
+    thumbnail_width,
+    analyze_workers,
+    processes,
+):
+    if resume and not state_dir:
+        raise click.UsageError("--resume requires --state-dir")
+    try:
+        screenshot_policy = ScreenshotPolicy(
+            mode=screenshots,
+            sample_every=screenshot_every,
+            format=screenshot_format,
+            quality=screenshot_quality,
+            viewport=viewport,
+            clip=screenshot_clip,
+            thumbnail_width=thumbnail_width,
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
     if "://" not in url:
         url = "https://" + url
     click.echo("URL is: '%s'" % url)
@@ -21,15 +156,32 @@ def main(url, rate_limit, max_pages, save):
         logger.debug("Rate limit set to %d milliseconds" % rate_limit)
     if max_pages:
         logger.debug("Crawl up to %d pages" % max_pages)
-    analyzer = Analyzer()
-    pdf_path, _, _ = run_full_analysis(
-        url,
-        analyzer,
-        converter=adapter,
-        rate_limit=rate_limit,
-        max_pages=max_pages,
-        save_crawled_pages=save,
-    )
+    if workers > 1:
+        logger.debug("Crawl with %d workers" % workers)
+
+    # imported when needed, so help and usage errors don't wait for the browser, parser and report packages
+    from website_checker.analyze.analyzer import Analyzer
+    from website_checker.analyze.result import adapter
+    from website_checker.main import run_full_analysis
+
+    with Analyzer(processes=processes) as analyzer:
+        pdf_path, _, _ = run_full_analysis(
+            url,
+            analyzer,
+            converter=adapter,
+            rate_limit=rate_limit,
+            max_pages=max_pages,
+            save_crawled_pages=save,
+            concurrency=workers,
+            state_dir=state_dir,
+            resume=resume,
+            seed_sitemaps=sitemap,
+            recrawl_cache=incremental,
+            lean=lean,
+            settle=settle,
+            screenshots=screenshot_policy,
+            analyze_workers=max(analyze_workers, processes),  # a thread per process keeps all busy
+        )
     click.echo("Report saved to file://%s" % pdf_path)
 
 
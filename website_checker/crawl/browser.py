@@ -1,33 +1,235 @@
 import datetime
+import threading
 import time
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
 
 from loguru import logger
-from playwright.sync_api import Page, sync_playwright
+from playwright.sync_api import BrowserContext, Page, sync_playwright
+
+from website_checker.crawl.settle import NetworkIdleSettle, SettleResult
+
+DEFAULT_PAGES_PER_CONTEXT = 50
+# storage of the origins of frames, which is cleared via CDP
+FRAME_STORAGE_TYPES = "local_storage,indexeddb,cache_storage,websql,file_systems"
+
+# Cookies are cleared by the context, this clears the storage of the origin of the open page.
+RESET_STORAGE_SCRIPT = """async () => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+    } catch (e) {}
+    if (window.indexedDB && indexedDB.databases) {
+        for (const db of await indexedDB.databases()) {
+            indexedDB.deleteDatabase(db.name);
+        }
+    }
+    if (window.caches) {
+        for (const key of await caches.keys()) {
+            await caches.delete(key);
+        }
+    }
+}"""
+
+
+class RateLimiter:
+    """Spaces requests by a minimum time, shared between all browsers of a crawl."""
+
+    def __init__(self, rate_limit=None):
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self._last_request = None
+        if self.rate_limit:
+            self._last_request = datetime.datetime.now() - datetime.timedelta(milliseconds=(rate_limit + 1000))
+
+    def wait(self):
+        """Waits until given rate limit is reached."""
+        if not self.rate_limit:
+            return
+        with self._lock:
+            time_delta = datetime.datetime.now() - self._last_request
+            elapsed_ms = time_delta.total_seconds() * 1000
+            if elapsed_ms < self.rate_limit:
+                sleep_time = self.rate_limit - elapsed_ms
+                logger.debug("Sleeping for %d milliseconds" % sleep_time)
+                time.sleep(sleep_time / 1000)
+            self._last_request = datetime.datetime.now()
+
+
+class ContextPool:
+    """Hands out clean incognito browser contexts and recycles them.
+
+    A context is reused for at most ``max_pages`` pages and closed afterwards,
+    which keeps the memory of long running crawls flat. Service workers are
+    blocked, so no page of a reused context is served by a worker of a former one.
+    """
+
+    def __init__(self, browser, max_pages=DEFAULT_PAGES_PER_CONTEXT, max_idle=1, viewport=None):
+        self._browser = browser
+        self.viewport = viewport
+        self.max_pages = max(1, max_pages)
+        self.max_idle = max_idle
+        self._idle: List[BrowserContext] = []
+        self._uses: Dict[BrowserContext, int] = {}
+        self.created = 0
+
+    @property
+    def alive(self) -> int:
+        """Number of contexts which are open in the browser."""
+        return len(self._uses)
+
+    def acquire(self) -> BrowserContext:
+        if self._idle:
+            return self._idle.pop()
+        options = {"service_workers": "block"}
+        if self.viewport:
+            options["viewport"] = self.viewport
+        context = self._browser.new_context(**options)  # incognito mode
+        self._uses[context] = 0
+        self.created += 1
+        return context
+
+    def release(self, context: BrowserContext, reusable=True):
+        """Returns a context to the pool or closes it, when it is used up."""
+        self._uses[context] += 1
+        if reusable and self._uses[context] < self.max_pages and len(self._idle) < self.max_idle:
+            try:
+                context.clear_cookies()
+                context.clear_permissions()
+                self._idle.append(context)
+                return
+            except Exception as e:
+                logger.debug(f"Could not reset browser context: {e}")
+        self._close(context)
+
+    def close(self):
+        for context in list(self._uses):
+            self._close(context)
+        self._idle = []
+
+    def _close(self, context: BrowserContext):
+        self._uses.pop(context, None)
+        try:
+            context.close()
+        except Exception as e:
+            logger.debug(f"Could not close browser context: {e}")
 
 
 class Browser:
-    def __init__(self, headless=True, rate_limit=None):
+    """Chromium with pooled contexts, which loads pages and renders PDFs.
+
+    The browser is re-entrant, it starts on the first ``with`` and stops when
+    the outermost ``with`` ends. So the crawl and the report share one
+    browser process.
+    """
+
+    def __init__(
+        self,
+        headless=True,
+        rate_limit=None,
+        rate_limiter=None,
+        pages_per_context=DEFAULT_PAGES_PER_CONTEXT,
+        settle=None,
+        viewport=None,
+    ):
         self.headless = headless
         self.playwright = None
         self._browser = None
+        self._contexts: Optional[ContextPool] = None
         self.page = None
         self.rate_limit = rate_limit
-        self._last_request = None
-        if self.rate_limit:
-            self._last_request = datetime.datetime.now() - datetime.timedelta(milliseconds=(rate_limit + 1000))
+        self.pages_per_context = pages_per_context
+        self.settle = settle or NetworkIdleSettle()
+        self.viewport = viewport
+        self.settled: Optional[SettleResult] = None  # of the open page
+        self._frame_origins: Set[str] = set()  # of the open page, which may have written storage
+        self._entered = 0
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(rate_limit)
+        self._rate_limiter = rate_limiter
+
+    def spawn(self) -> "Browser":
+        """Returns a new, not yet started browser with the same settings.
+
+        Playwright objects are bound to the thread which started them, so every
+        crawler worker runs its own browser. The rate limit stays shared.
+        """
+        return Browser(
+            headless=self.headless,
+            rate_limit=self.rate_limit,
+            rate_limiter=self._rate_limiter,
+            pages_per_context=self.pages_per_context,
+            settle=self.settle,
+            viewport=self.viewport,
+        )
+
+    @property
+    def contexts_alive(self) -> int:
+        """Number of open browser contexts."""
+        if self._contexts is None:
+            return 0
+        return self._contexts.alive
 
-    def goto(self, url: str, hooks=None) -> Page:
-        context = self._browser.new_context()  # incognito mode
+    def goto(self, url: str, hooks=None, route=None) -> Page:
+        context = self._contexts.acquire()
         self.page = context.new_page()
+        self._frame_origins = set()
+        self.page.on("framenavigated", self._record_frame_origin)
+        self._disable_cache(context, self.page)
         if hooks:
             self._register_hooks(*hooks)
+        if route:
+            self.page.route("**/*", route)
         self._wait_rate_limit()
-        self.page.goto(url, wait_until="networkidle")
+        self.settled = self.settle.goto(self.page, url)
+        logger.debug(f"Page settled by {self.settled.reason} after {self.settled.duration:.0f} ms")
         return self.page
 
+    def pdf(self, html: str, path=None, **options) -> bytes:
+        """Renders HTML to PDF in a new page, options are passed to Playwright's ``page.pdf``."""
+        context = self._contexts.acquire()
+        page = context.new_page()
+        try:
+            page.set_content(html)
+            return page.pdf(path=path, **options)
+        finally:
+            page.close()
+            self._contexts.release(context)
+
     def close_page(self):
         if self.page:
-            self.page.close()
+            page, self.page = self.page, None
+            self.settled = None
+            reusable = self._reset_storage(page)
+            context = page.context
+            page.close()
+            self._contexts.release(context, reusable=reusable)
+
+    def _reset_storage(self, page: Page) -> bool:
+        """Clears the web storage of the page and its frames, returns False if that is not possible."""
+        try:
+            page.evaluate(RESET_STORAGE_SCRIPT)
+            origins = self._frame_origins - {_origin(page.url)}
+            if origins:
+                session = page.context.new_cdp_session(page)
+                for origin in sorted(origins):
+                    session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": FRAME_STORAGE_TYPES})
+            return True
+        except Exception as e:
+            logger.debug(f"Could not reset storage of {page.url}: {e}")
+            return False
+
+    def _record_frame_origin(self, frame):
+        origin = _origin(frame.url)
+        if origin:
+            self._frame_origins.add(origin)
+
+    def _disable_cache(self, context: BrowserContext, page: Page):
+        """Disables the HTTP cache of a page, so each page of a reused context loads cold."""
+        try:
+            context.new_cdp_session(page).send("Network.setCacheDisabled", {"cacheDisabled": True})
+        except Exception as e:
+            logger.debug(f"Could not disable the cache of the page: {e}")
 
     def _register_hooks(self, request_failed, response, request_finished, download):
         self.page.on("requestfailed", request_failed)
@@ -37,19 +239,30 @@ class Browser:
 
     def _wait_rate_limit(self):
         """Waits until given rate limit is reached."""
-        if self.rate_limit:
-            time_delta = datetime.datetime.now() - self._last_request
-            if time_delta.total_seconds() < self.rate_limit:
-                sleep_time = self.rate_limit - time_delta.total_seconds()
-                logger.debug("Sleeping for %d milliseconds" % sleep_time)
-                time.sleep(sleep_time / 1000)
-            self._last_request = datetime.datetime.now()
+        self._rate_limiter.wait()
 
     def __enter__(self):
-        self.playwright = sync_playwright().start()
-        self._browser = self.playwright.chromium.launch(headless=self.headless)
+        if not self._entered:
+            self.playwright = sync_playwright().start()
+            self._browser = self.playwright.chromium.launch(headless=self.headless)
+            self._contexts = ContextPool(self._browser, max_pages=self.pages_per_context, viewport=self.viewport)
+        self._entered += 1
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._entered -= 1
+        if self._entered:
+            return
+        logger.debug(f"Created {self._contexts.created} browser contexts, {self._contexts.alive} alive")
+        self._contexts.close()
+        self._contexts = None
         self.playwright.stop()
         self.playwright = None
+
+
+def _origin(url: str) -> Optional[str]:
+    """Returns the origin of a web url, e.g. ``https://domain.url``."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
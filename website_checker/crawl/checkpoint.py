@@ -0,0 +1,160 @@
+import json
+import pickle
+import threading
+from pathlib import Path
+from typing import Iterable, List, Set, Tuple, Union
+
+from loguru import logger
+
+from website_checker.crawl.websitepage import WebsitePage
+from website_checker.utils import canonical_url
+
+
+class CheckpointException(Exception):
+    pass
+
+
+class CrawlCheckpoint:
+    """Append-only store of the progress of a crawl.
+
+    Queued and visited urls are appended as JSON lines, crawled pages as
+    consecutive pickles. A crawl which stopped unexpectedly continues from the
+    stored state, a truncated last record is ignored.
+    """
+
+    META_FILE = "crawl.json"
+    LINKS_FILE = "links.jsonl"
+    PAGES_FILE = "pages.pickle"
+
+    def __init__(self, state_dir: Union[str, Path]):
+        self.state_dir = Path(state_dir)
+        self._lock = threading.Lock()
+        self._links_file = None
+        self._pages_file = None
+        self._restored_pages: List[WebsitePage] = []
+        self._page_urls: Set[str] = set()
+
+    @property
+    def links_path(self) -> Path:
+        return self.state_dir / self.LINKS_FILE
+
+    @property
+    def pages_path(self) -> Path:
+        return self.state_dir / self.PAGES_FILE
+
+    @property
+    def meta_path(self) -> Path:
+        return self.state_dir / self.META_FILE
+
+    def start(self, url: str, resume=False):
+        """Prepares the state directory for a crawl of the given url.
+
+        Without resume, a former state is removed.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        if resume and self.meta_path.is_file():
+            stored_url = json.loads(self.meta_path.read_text()).get("url")
+            if stored_url != url:
+                raise CheckpointException(f"State in '{self.state_dir}' belongs to a crawl of {stored_url}.")
+            self._restored_pages = self._read_pages()
+            self._read_links()
+        else:
+            for path in (self.links_path, self.pages_path):
+                if path.exists():
+                    path.unlink()
+            self.meta_path.write_text(json.dumps({"url": url}))
+        self._links_file = open(self.links_path, "a", encoding="utf-8")
+        self._pages_file = open(self.pages_path, "ab")
+
+    def close(self):
+        for file in (self._links_file, self._pages_file):
+            if file:
+                file.close()
+        self._links_file = None
+        self._pages_file = None
+
+    def record_queued(self, url: str):
+        self._append_link("queued", url)
+
+    def record_visited(self, urls: Iterable[str]):
+        for url in urls:
+            self._append_link("visited", url)
+
+    def add_page(self, page: WebsitePage, visited: Iterable[str] = ()):
+        """Stores a crawled page and marks its urls as visited."""
+        with self._lock:
+            pickle.dump(page, self._pages_file)
+            self._pages_file.flush()
+        self.record_visited(visited)
+
+    def load_pages(self) -> List[WebsitePage]:
+        """Returns the pages of a resumed crawl."""
+        pages, self._restored_pages = self._restored_pages, []
+        return pages
+
+    def load_links(self) -> Tuple[List[str], Set[str]]:
+        """Returns the urls which are still to be crawled and the visited urls."""
+        queued, visited = self._read_links()
+        visited.update(self._page_urls)
+        remaining = [url for url in queued if canonical_url(url) not in visited]
+        return remaining, visited
+
+    def _read_pages(self) -> List[WebsitePage]:
+        pages: List[WebsitePage] = []
+        if not self.pages_path.is_file():
+            return pages
+        with open(self.pages_path, "rb") as f:
+            valid_length = 0
+            while True:
+                try:
+                    pages.append(pickle.load(f))
+                    valid_length = f.tell()
+                except EOFError:
+                    break
+                except Exception as e:
+                    logger.warning(f"Ignore truncated page record in '{self.pages_path}': {e}")
+                    break
+        _truncate(self.pages_path, valid_length)
+        self._page_urls = {canonical_url(page.url) for page in pages}
+        return pages
+
+    def _read_links(self) -> Tuple[List[str], Set[str]]:
+        queued: List[str] = []
+        visited: Set[str] = set()
+        if not self.links_path.is_file():
+            return queued, visited
+        with open(self.links_path, "rb") as f:
+            valid_length = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if record is None or not line.endswith(b"\n"):
+                    logger.warning(f"Ignore truncated link record in '{self.links_path}'")
+                    break
+                valid_length += len(line)
+                if "queued" in record:
+                    queued.append(record["queued"])
+                elif "visited" in record:
+                    visited.add(canonical_url(record["visited"]))
+        _truncate(self.links_path, valid_length)
+        return queued, visited
+
+    def _append_link(self, state: str, url: str):
+        with self._lock:
+            self._links_file.write(json.dumps({state: url}) + "\n")
+            self._links_file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _truncate(path: Path, length: int):
+    """Cuts off an incomplete record, so new records are appended after valid ones."""
+    if path.stat().st_size > length:
+        with open(path, "r+b") as f:
+            f.truncate(length)
@@ -1,16 +1,26 @@
-import bisect
+import queue
 import re
+import threading
 import urllib
-from typing import Any, List, Set, Tuple
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from urllib.parse import ParseResult, urldefrag, urljoin, urlparse
 
-import requests
 from loguru import logger
 from playwright.sync_api import Page, Request, Response
 
 from website_checker.crawl.cookie import Cookie
+from website_checker.crawl.favicon import FaviconVerifier
+from website_checker.crawl.frontier import FIFO, Frontier
+from website_checker.crawl.interception import (
+    InterceptedResource,
+    InterceptionPolicy,
+    ResourceInterceptor,
+)
 from website_checker.crawl.resource import Resource, ResourceRequest
+from website_checker.crawl.screenshot import ScreenshotPolicy, Screenshotter
 from website_checker.crawl.websitepage import WebsitePage
+from website_checker.utils import UrlIndex, canonical_url
 
 
 class CrawlerException(Exception):
@@ -30,88 +40,277 @@ class NoPageException(CrawlerException):
     pass
 
 
-class Crawler:
-    def __init__(self, browser, url: str):
-        self._browser = browser
-        self.domain = get_base_domain(url)
-        self.collected_links: list = []
-        self.visited_links: Set = set()
+class PageTraffic:
+    """Collects the network traffic of a single page visit.
+
+    With an interception policy, heavy resources are described by their
+    intercepted metadata instead of the stubbed or aborted responses.
+    """
 
+    def __init__(self, interception: Optional[InterceptionPolicy] = None):
         self.responses: List = []
         self.requests: List = []
         self.failed_requests: List = []
+        self._interceptor = ResourceInterceptor(interception) if interception else None
+
+    @property
+    def route(self):
+        """Route handler for the page or None, when nothing is intercepted."""
+        return self._interceptor.handle if self._interceptor else None
+
+    @property
+    def intercepted(self) -> Dict[str, InterceptedResource]:
+        return self._interceptor.intercepted if self._interceptor else {}
+
+    def resources(self) -> List[Resource]:
+        intercepted = dict(self.intercepted)
+        resources = []
+        for response in self.responses:
+            meta = intercepted.pop(response.url, None)
+            resources.append(meta.to_resource() if meta else create_resource(response))
+        resources.extend(meta.to_resource() for meta in intercepted.values())  # aborted without response
+        return resources
+
+    def fine_requests(self) -> List[ResourceRequest]:
+        intercepted = dict(self.intercepted)
+        fine_requests = []
+        for req in self.requests:
+            if req.failure:
+                continue
+            meta = intercepted.pop(req.url, None)
+            fine_requests.append(meta.to_request() if meta else ResourceRequest(url=req.url, sizes=req.sizes()))
+        fine_requests.extend(meta.to_request() for meta in intercepted.values())
+        return fine_requests
+
+    def failed(self) -> List[ResourceRequest]:
+        """Returns failed requests, except those aborted on purpose."""
+        intercepted = self.intercepted
+        return [
+            ResourceRequest(url=req.url, failure=req.failure)
+            for req in self.failed_requests
+            if req.url not in intercepted
+        ]
+
+    def hooks(self) -> Tuple:
+        return (
+            self._requestfailed_hook,
+            self._response_hook,
+            self._requestfinished_hook,
+            self._download_hook,
+        )
+
+    def _requestfailed_hook(self, request: Request):
+        logger.debug(f"Request failed for: {request.url}")
+        self.failed_requests.append(request)
+
+    def _response_hook(self, response: Response):
+        self.responses.append(response)
+
+    def _requestfinished_hook(self, request: Request):
+        self.requests.append(request)
+
+    def _download_hook(self, download):
+        logger.debug(f"Download appeared: {download.url}")
+        if not self.responses:
+            download.cancel()
+            raise NoPageException(download.url)
+
+
+_WORKER_DONE = object()
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", "avif")
+
 
-        self._add_url(url)  # add start url
+class Crawler:
+    def __init__(
+        self,
+        browser,
+        url: str,
+        concurrency: int = 1,
+        order=FIFO,
+        checkpoint=None,
+        recrawl=None,
+        interception: Optional[InterceptionPolicy] = None,
+        screenshots: Optional[ScreenshotPolicy] = None,
+    ):
+        self._browser = browser
+        self._interception = interception
+        self._screenshots = Screenshotter(screenshots)
+        self._checkpoint = checkpoint
+        self._recrawl = recrawl
+        self._favicons = FaviconVerifier()
+        self.domain = canonical_url(get_base_domain(url))
+        self.collected_links = Frontier(order)
+        self.visited_links = UrlIndex()
+        self.concurrency = max(1, concurrency or 1)
+
+        # guards collected_links and visited_links, which are shared by all workers
+        self._lock = threading.Condition(threading.RLock())
+        self._in_progress = 0
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._running_workers = 0
+        self._pages: queue.Queue = queue.Queue(maxsize=2 * self.concurrency)
+
+        if not self._restore_checkpoint():
+            self._add_url(url)  # add start url
 
     def __enter__(self):
-        self._browser.__enter__()
+        if self.concurrency > 1:
+            self._start_workers()
+        else:
+            self._browser.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._browser.__exit__(exc_type, exc_val, exc_tb)
+        if self.concurrency > 1:
+            self._stop_workers()
+        else:
+            self._browser.__exit__(exc_type, exc_val, exc_tb)
+        self._favicons.close()
+        self._screenshots.close()
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        if self.concurrency > 1:
+            return self._next_finished_page()
         try:
             return self.next_page()
         except Exception:
             raise StopIteration
 
     def next_page(self) -> WebsitePage:
-        next_url = self.collected_links.pop(0)
+        next_url = self.collected_links.pop()
         logger.info(f"Visit next: {next_url}")
         try:
             return self._next_page(next_url)
         except CrawlerException as e:
             logger.debug(f"Link skipped: {e}")
+            self._record_visited(next_url, e.url)
             return self.next_page()
 
-    def _reset_data(self):
-        self.responses = []
-        self.requests = []
-        self.failed_requests = []
-
-    def _register_hooks(self, page: Page):
-        page.on("requestfailed", self._requestfailed_hook)
-        page.on("response", self._response_hook)
-        page.on("requestfinished", self._requestfinished_hook)
-        page.on("download", self._download_hook)
-
-    def _next_page(self, url: str):
-        self._reset_data()
-        try:
-            page = self._browser.goto(
-                url,
-                hooks=(
-                    self._requestfailed_hook,
-                    self._response_hook,
-                    self._requestfinished_hook,
-                    self._download_hook,
-                ),
+    def _start_workers(self):
+        """Starts one worker thread with its own browser per concurrent page."""
+        for idx in range(self.concurrency):
+            worker = threading.Thread(
+                target=self._worker,
+                args=(self._browser.spawn(),),
+                name=f"crawler-worker-{idx}",
+                daemon=True,
             )
+            self._workers.append(worker)
+        self._running_workers = len(self._workers)
+        for worker in self._workers:
+            worker.start()
+
+    def _stop_workers(self):
+        self._stop.set()
+        with self._lock:
+            self._lock.notify_all()
+        for worker in self._workers:
+            while worker.is_alive():
+                self._drain_pages()
+                worker.join(timeout=0.1)
+        self._drain_pages()
+
+    def _drain_pages(self):
+        """Discards finished pages, so no worker blocks on a full queue."""
+        try:
+            while True:
+                self._pages.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _next_finished_page(self) -> WebsitePage:
+        while self._running_workers:
+            page = self._pages.get()
+            if page is _WORKER_DONE:
+                self._running_workers -= 1
+                continue
+            return page
+        raise StopIteration
+
+    def _worker(self, browser):
+        try:
+            with browser:
+                while True:
+                    url = self._take_url()
+                    if url is None:
+                        break
+                    logger.info(f"Visit next: {url}")
+                    try:
+                        self._publish(self._next_page(url, browser))
+                    except CrawlerException as e:
+                        logger.debug(f"Link skipped: {e}")
+                        self._record_visited(url, e.url)
+                    except Exception as e:
+                        logger.error(f"Failed to crawl {url}: {e}")
+                    finally:
+                        self._release_url()
+        except Exception as e:
+            logger.error(f"Crawler worker stopped: {e}")
+        finally:
+            self._pages.put(_WORKER_DONE)
+
+    def _take_url(self):
+        """Returns the next url to visit or None, when the crawl is finished."""
+        with self._lock:
+            while not self.collected_links and self._in_progress and not self._stop.is_set():
+                # pages in progress may still add new links
+                self._lock.wait()
+            if self._stop.is_set() or not self.collected_links:
+                self._lock.notify_all()
+                return None
+            self._in_progress += 1
+            url = self.collected_links.pop()
+            self.visited_links.add(url)  # keeps other workers from queueing it again
+            return url
+
+    def _release_url(self):
+        with self._lock:
+            self._in_progress -= 1
+            self._lock.notify_all()
+
+    def _publish(self, page: WebsitePage):
+        while not self._stop.is_set():
+            try:
+                self._pages.put(page, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _next_page(self, url: str, browser=None):
+        if browser is None:
+            browser = self._browser
+        if self._recrawl and self._recrawl.is_unchanged(url):
+            return self._unchanged_page(url)
+        traffic = PageTraffic(self._interception)
+        try:
+            page = browser.goto(url, hooks=traffic.hooks(), route=traffic.route)
             current_url = page.url
-            self._check_redirects(url, current_url)
-            self.visited_links.add(url)
-            self.visited_links.add(current_url)
+            with self._lock:
+                self._check_redirects(url, current_url)
+                self.visited_links.add(url)
+                self.visited_links.add(current_url)
 
             html = page.content()
             title = page.title()
+            document = next((response for response in traffic.responses if response.url == current_url), None)
+            headers = dict(document.headers) if document else {}
             temp_cookies = page.context.cookies()
             cookies = [Cookie(name=cookie["name"]) for cookie in temp_cookies]
-            elements = [create_resource(response) for response in self.responses]
-            fine_requests = [
-                ResourceRequest(url=req.url, sizes=req.sizes()) for req in self.requests if not req.failure
-            ]
-            failed_requests = [ResourceRequest(url=req.url, failure=req.failure) for req in self.failed_requests]
+            elements = traffic.resources()
+            fine_requests = traffic.fine_requests()
+            failed_requests = traffic.failed()
 
-            handle_favicons(self.domain, current_url, html, elements, failed_requests)
-            screenshot_encoded = page.screenshot()
+            favicon_checks = start_favicon_checks(self.domain, current_url, html, self._favicons)
+            screenshot, thumbnail = self._screenshots.capture(page)
 
-            self._gather_new_links(page, current_url)
+            links = self._gather_new_links(page, current_url)
+            add_favicon_results(favicon_checks, elements, failed_requests)
 
-            return WebsitePage(
+            website_page = WebsitePage(
                 url=current_url,
                 title=title,
                 html=html,
@@ -119,15 +318,32 @@ class Crawler:
                 elements=elements,
                 requests=fine_requests,
                 failed_requests=failed_requests,
-                screenshot=screenshot_encoded,
+                screenshot=screenshot,
+                thumbnail=thumbnail,
+                headers=headers,
+                links=sorted(links),
+                settle=browser.settled,
             )
+            if self._checkpoint:
+                self._checkpoint.add_page(website_page, visited=(url, current_url))
+            return website_page
         finally:
-            self._browser.close_page()
+            browser.close_page()
+
+    def _unchanged_page(self, url: str) -> WebsitePage:
+        """Continues with the links of a page, which didn't change since the former run."""
+        logger.debug(f"Page not modified: {url}")
+        record = self._recrawl.get(url)
+        self._queue_links(set(record.links), [url, record.url])
+        website_page = WebsitePage(url=record.url, title=record.evaluation.title, links=record.links, not_modified=True)
+        if self._checkpoint:
+            self._checkpoint.add_page(website_page, visited=(url, record.url))
+        return website_page
 
     def _check_redirects(self, set_url, current_url):
-        if set_url.lstrip("/") != current_url.lstrip("/"):
+        if canonical_url(set_url) != canonical_url(current_url):
             logger.debug(f"Redirected to {current_url}")
-            if not is_internal_link(current_url, self.domain):
+            if not is_internal_link(canonical_url(current_url), self.domain):
                 logger.debug(f"Skip link to external page: {current_url}")
                 raise ExternalLinkException(current_url)
             elif link_already_visited(current_url, self.visited_links):
@@ -139,9 +355,19 @@ class Crawler:
         link_elements = page.query_selector_all(css_selector)
         all_links_on_page = {link.get_attribute("href") for link in link_elements}
         normalized_links = {normalize_url(self.domain, link, current_url) for link in all_links_on_page}
-        unvisited_links = get_unvisited_links(normalized_links, self.visited_links, self.domain)
-        for link in unvisited_links:
-            self._add_url(link)
+        internal_links = {link for link in normalized_links if is_internal_link(canonical_url(link), self.domain)}
+        self._queue_links(internal_links)
+        return internal_links
+
+    def _queue_links(self, links: Set[str], visited=()):
+        """Marks urls as visited and queues the unvisited links."""
+        with self._lock:
+            for url in visited:
+                self.visited_links.add(url)
+            unvisited_links = get_unvisited_links(links, self.visited_links, self.domain)
+            for link in sorted(unvisited_links):
+                self._add_url(link)
+            self._lock.notify_all()
 
     def _normalize_url(self, link, current_url):
         return normalize_url(self.domain, link, current_url)
@@ -149,42 +375,75 @@ class Crawler:
     def _add_url(self, url):
         """Adds a url to the crawler."""
         normalized_url = self._normalize_url(url, self.domain)
-        add_element_sorted_unique(self.collected_links, normalized_url)
-
-    def _requestfailed_hook(self, request: Request):
-        logger.debug(f"Request failed for: {request.url}")
-        self.failed_requests.append(request)
+        if self.collected_links.push(normalized_url) and self._checkpoint:  # compared by its canonical form
+            self._checkpoint.record_queued(normalized_url)
+
+    def seed(self, urls: Iterable[str]) -> int:
+        """Queues internal urls before crawling, e.g. from a sitemap.
+
+        Returns the number of new urls.
+        """
+        added = 0
+        with self._lock:
+            for url in urls:
+                link = canonical_url(url)
+                if (
+                    not is_internal_link(link, self.domain)
+                    or link.endswith(IMAGE_EXTENSIONS)
+                    or link in self.visited_links
+                    or link in self.collected_links
+                ):
+                    continue
+                self._add_url(url)
+                added += 1
+            self._lock.notify_all()
+        logger.info(f"Seeded crawler with {added} urls")
+        return added
+
+    def _restore_checkpoint(self) -> bool:
+        """Continues with the links of a former crawl, returns False if there is none."""
+        if not self._checkpoint:
+            return False
+        remaining, visited = self._checkpoint.load_links()
+        if not remaining and not visited:
+            return False
+        for url in visited:
+            self.visited_links.add(url)
+        for url in remaining:
+            self.collected_links.push(url)
+        logger.info(f"Resume crawl with {len(visited)} visited and {len(remaining)} queued links")
+        return True
 
-    def _response_hook(self, response: Response):
-        self.responses.append(response)
+    def _record_visited(self, *urls):
+        if self._checkpoint:
+            self._checkpoint.record_visited(urls)
 
-    def _requestfinished_hook(self, request: Request):
-        self.requests.append(request)
 
-    def _download_hook(self, download):
-        logger.debug(f"Download appeared: {download.url}")
-        if not self.responses:
-            download.cancel()
-            raise NoPageException(download.url)
-
-
-def link_already_visited(url: str, visited_links: Set[str]):
+def link_already_visited(url: str, visited_links: Union[UrlIndex, Set[str]]):
     """Checks if a link is already visited."""
-    link = {url.rstrip("/")}
-    visited_links = {link.rstrip("/") for link in visited_links}
-    return not bool(link - visited_links)
+    if not isinstance(visited_links, UrlIndex):
+        visited_links = UrlIndex(visited_links)
+    return url in visited_links
 
 
-def get_unvisited_links(links: Set[str], visited_links: Set[str], domain: str) -> Set[str]:
-    """Returns a set of unvisited internal pages."""
-    links = {link.rstrip("/") for link in links if type(link) == str}
-    visited_links = {link.rstrip("/") for link in visited_links}
-    unvisited_links = links - visited_links
+def get_unvisited_links(links: Set[str], visited_links: Union[UrlIndex, Set[str]], domain: str) -> Set[str]:
+    """Returns a set of unvisited internal pages.
 
-    internal_links = {link for link in unvisited_links if type(link) == str and is_internal_link(link, domain)}
-    images = (".png", ".jpg", ".jpeg", ".webp", "avif")
-    unvisited_internal_pages = {link for link in internal_links if not link.endswith(images)}
-    return unvisited_internal_pages
+    Links are compared by their canonical form, but returned as they were found,
+    so the browser requests the url of the link. Of links with the same
+    canonical form, one is kept.
+    """
+    if not isinstance(visited_links, UrlIndex):
+        visited_links = UrlIndex(visited_links)
+    domain = canonical_url(domain)
+    unvisited_internal_pages: Dict[str, str] = {}
+    for link in sorted(link for link in links if type(link) == str):
+        key = canonical_url(link)
+        if key in unvisited_internal_pages or key in visited_links:
+            continue
+        if is_internal_link(key, domain) and not key.endswith(IMAGE_EXTENSIONS):
+            unvisited_internal_pages[key] = link
+    return set(unvisited_internal_pages.values())
 
 
 def get_base_domain(url: str) -> str:
@@ -256,36 +515,30 @@ def normalize_url(domain: str, link: str, current_url: str) -> str:
         return urljoin(current_url, link)
 
 
-def add_element_sorted_unique(lst, item):
-    index = bisect.bisect_left(lst, item)
-    if index == len(lst) or lst[index] != item:
-        lst.insert(index, item)
+def start_favicon_checks(
+    domain: str, current_url: str, html: str, verifier: FaviconVerifier
+) -> List[Tuple[str, Future]]:
+    """Special handling for favicons as long as Playwright does not support them.
+
+    Starts the checks in the background, while the page is processed further.
+    """
+    pattern = r'<link[^>]*rel=["\'](?:shortcut )?icon["\'][^>]*href=["\']([^"\']+)["\'][^>]*>'
+    icon_urls = re.findall(pattern, html, re.I)
+    checks = []
+    for url in icon_urls:
+        url = normalize_url(domain, url, current_url)
+        if not url.startswith(("http://", "https://")):
+            continue  # e.g. inline data URIs
+        checks.append((url, verifier.submit(url)))
+    return checks
 
 
-def handle_favicons(
-    domain: str,
-    current_url: str,
-    html: str,
+def add_favicon_results(
+    checks: List[Tuple[str, Future]],
     elements: List[Resource],
     failed_requests: List[ResourceRequest],
 ):
-    """Special handling for favicons as long as Playwright does not support them."""
-
-    def extract_all_icon_urls(raw_html: str):
-        pattern = r'<link[^>]*rel=["\'](?:shortcut )?icon["\'][^>]*href=["\']([^"\']+)["\'][^>]*>'
-        matches = re.findall(pattern, raw_html, re.I)
-        return matches
-
-    def favicon_loads(icon_url: str) -> Tuple[bool, Any]:
-        try:
-            response = requests.get(url, allow_redirects=False)
-            if response.status_code == 200:
-                # Check if the response contains valid image data
-                if "image" in str(response.headers.get("content-type")):
-                    return True, response.headers
-            return False, None
-        except requests.exceptions.RequestException:
-            return False, None
+    """Adds the results of the favicon checks to the resources of a page."""
 
     def is_url_not_in_list(item_url, object_list):
         for obj in object_list:
@@ -293,10 +546,8 @@ def handle_favicons(
                 return False
         return True
 
-    icon_urls = extract_all_icon_urls(html)
-    for url in icon_urls:
-        url = normalize_url(domain, url, current_url)
-        loads, headers = favicon_loads(url)
+    for url, check in checks:
+        loads, headers = check.result()
         if loads:
             if is_url_not_in_list(url, elements):
                 elements.append(Resource(url=url, headers=headers, status_code=200))
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT = 10  # seconds
+
+
+class FaviconVerifier:
+    """Checks in the background whether favicons load, once per url and crawl.
+
+    Playwright doesn't report favicon requests, so they are requested
+    separately through a pooled HTTP session.
+    """
+
+    def __init__(self, max_workers=4, timeout=REQUEST_TIMEOUT, session: Optional[requests.Session] = None):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self._session = session
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="favicon")
+        self._results: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, url: str) -> "Future[Tuple[bool, Any]]":
+        """Starts the check of a favicon, a known url reuses the former result."""
+        with self._lock:
+            if url not in self._results:
+                self._results[url] = self._executor.submit(self._favicon_loads, url)
+            return self._results[url]
+
+    def verify(self, url: str) -> Tuple[bool, Any]:
+        """Returns whether the favicon loads and its headers."""
+        return self.submit(url).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def _favicon_loads(self, icon_url: str) -> Tuple[bool, Any]:
+        try:
+            with self._session.get(icon_url, allow_redirects=False, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 200:
+                    # Check if the response contains valid image data
+                    if "image" in str(response.headers.get("content-type")):
+                        return True, response.headers
+            return False, None
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Favicon does not load: {icon_url}, {e}")
+            return False, None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
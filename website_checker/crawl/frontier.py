@@ -0,0 +1,88 @@
+import heapq
+import itertools
+from collections import deque
+from typing import Any, Callable, Deque, Iterator, List, Set, Tuple, Union
+
+from website_checker.utils import canonical_url
+
+FIFO = "fifo"
+DEPTH = "depth"
+
+
+def url_depth(url: str) -> int:
+    """Returns the number of path segments of a url.
+
+    Examples
+    --------
+    >>> url_depth("https://www.domain.com")
+    0
+    >>> url_depth("https://www.domain.com/service/pc/")
+    2
+    """
+    path = url.partition("://")[2].partition("/")[2]  # cheaper than urlparse for millions of urls
+    path = path.partition("?")[0].partition("#")[0]
+    return len([part for part in path.split("/") if part])
+
+
+class Frontier:
+    """Queue of urls, which are still to be crawled.
+
+    Urls are compared by their canonical form. Enqueue, dequeue and membership tests
+    don't depend on the number of queued urls in FIFO order and are logarithmic for
+    prioritized orders.
+
+    Parameters
+    ----------
+    order
+        ``"fifo"`` crawls breadth-first in order of discovery, ``"depth"`` prefers urls
+        with fewer path segments. A callable maps a url to a score, lower scores are
+        crawled first.
+    """
+
+    def __init__(self, order: Union[str, Callable[[str], Any]] = FIFO):
+        self._queued: Set[str] = set()
+        self._fifo: Deque[Tuple[str, str]] = deque()
+        self._heap: List[Tuple[Any, int, str, str]] = []
+        self._counter = itertools.count()  # keeps equal scores in order of discovery
+
+        if order == FIFO:
+            self._score = None
+        elif order == DEPTH:
+            self._score = url_depth
+        elif callable(order):
+            self._score = order
+        else:
+            raise ValueError(f"Unknown frontier order: {order}")
+
+    def push(self, url: str) -> bool:
+        """Adds a url, returns False when it is already queued."""
+        key = canonical_url(url)
+        if key in self._queued:
+            return False
+        self._queued.add(key)
+        if self._score is None:
+            self._fifo.append((url, key))
+        else:
+            heapq.heappush(self._heap, (self._score(url), next(self._counter), url, key))
+        return True
+
+    def pop(self) -> str:
+        """Removes and returns the next url to crawl."""
+        if self._score is None:
+            url, key = self._fifo.popleft()
+        else:
+            _, _, url, key = heapq.heappop(self._heap)
+        self._queued.remove(key)
+        return url
+
+    def __contains__(self, url) -> bool:
+        return isinstance(url, str) and canonical_url(url) in self._queued
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates the queued urls in crawl order without removing them."""
+        if self._score is None:
+            return iter([url for url, _ in self._fifo])
+        return iter([url for _, _, url, _ in sorted(self._heap)])
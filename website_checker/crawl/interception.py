@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Request, Route
+
+from website_checker.crawl.resource import Resource, ResourceRequest
+
+STUB = "stub"
+ABORT = "abort"
+HEAVY_RESOURCE_TYPES = ("image", "media", "font")
+# describe the original body, which is not sent to the browser
+SKIPPED_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+
+@dataclass
+class InterceptionPolicy:
+    """Decides which resources are loaded without their body.
+
+    Parameters
+    ----------
+    resource_types
+        Playwright resource types to intercept.
+    action
+        ``"stub"`` answers with the original status and headers and an empty body,
+        ``"abort"`` cancels the request after its metadata is known.
+    min_size
+        Resources with a smaller Content-Length load normally, in bytes.
+    """
+
+    resource_types: Tuple[str, ...] = HEAVY_RESOURCE_TYPES
+    action: str = STUB
+    min_size: int = 0
+
+    def __post_init__(self):
+        if self.action not in (STUB, ABORT):
+            raise ValueError(f"Unknown interception action: {self.action}")
+
+
+@dataclass
+class InterceptedResource:
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    size: int = 0
+
+    def to_resource(self) -> Resource:
+        return Resource(url=self.url, status_code=self.status, headers=self.headers)
+
+    def to_request(self) -> ResourceRequest:
+        sizes = {"requestBodySize": 0, "requestHeadersSize": 0, "responseBodySize": self.size, "responseHeadersSize": 0}
+        return ResourceRequest(url=self.url, sizes=sizes, headers=self.headers)
+
+
+class ResourceInterceptor:
+    """Records the metadata of heavy resources and keeps their bodies from loading.
+
+    Status, headers and Content-Length are requested with HEAD, so size checks
+    work as if the resource was loaded. Resources whose HEAD request fails or
+    does not tell the size load normally.
+    """
+
+    def __init__(self, policy: InterceptionPolicy):
+        self.policy = policy
+        self.intercepted: Dict[str, InterceptedResource] = {}
+
+    def handle(self, route: "Route", request: "Request"):
+        if request.resource_type not in self.policy.resource_types or request.method != "GET":
+            route.continue_()
+            return
+        try:
+            response = route.fetch(method="HEAD")
+        except Exception as e:
+            logger.debug(f"Could not request metadata of {request.url}: {e}")
+            route.continue_()
+            return
+
+        headers = response.headers
+        size = _content_length(headers)
+        if not 200 <= response.status < 400 or size is None or size < self.policy.min_size:
+            route.continue_()  # e.g. HEAD is not allowed, the GET may still succeed
+            return
+
+        self.intercepted[request.url] = InterceptedResource(request.url, response.status, headers, size)
+        if self.policy.action == ABORT:
+            route.abort("blockedbyclient")
+        else:
+            stub_headers = {key: value for key, value in headers.items() if key.lower() not in SKIPPED_HEADERS}
+            route.fulfill(status=response.status, headers=stub_headers, body=b"")
+
+
+def _content_length(headers: Dict[str, str]) -> Optional[int]:
+    try:
+        return int(headers["content-length"])
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,141 @@
+import pickle
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import requests
+from loguru import logger
+
+from website_checker.analyze.result import PageEvaluation, Result
+from website_checker.crawl.websitepage import WebsitePage
+from website_checker.utils import canonical_url
+
+REQUEST_TIMEOUT = 10  # seconds
+
+
+@dataclass
+class PageRecord:
+    """What is known about a page from a former run."""
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    lastmod: Optional[str] = None  # from the sitemap
+    links: List[str] = field(default_factory=list)
+    evaluation: Any = None
+
+
+class RecrawlCache:
+    """Remembers the pages of a former run to skip unchanged pages.
+
+    A page is unchanged, when its sitemap lastmod didn't change or the server
+    answers a conditional request with 304 Not Modified. Such pages are neither
+    rendered nor analyzed again, their stored evaluation is reused. Rendered
+    pages are always analyzed again, as the checks read their cookies and
+    resources besides the HTML.
+    """
+
+    def __init__(self, path: Union[str, Path], session: Optional[requests.Session] = None):
+        self.path = Path(path)
+        self._session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._records: Dict[str, PageRecord] = self._load()
+        self._next_records: Dict[str, PageRecord] = {}
+        self._lastmods: Dict[str, str] = {}
+
+    def get(self, url: str) -> Optional[PageRecord]:
+        return self._records.get(canonical_url(url))
+
+    def set_lastmods(self, entries: Iterable[Any]):
+        """Remembers the current lastmod of sitemap entries."""
+        for entry in entries:
+            if entry.lastmod:
+                self._lastmods[canonical_url(entry.url)] = entry.lastmod
+
+    def is_unchanged(self, url: str) -> bool:
+        """Checks cheaply, whether a page changed since the former run."""
+        record = self.get(url)
+        if record is None or record.evaluation is None:
+            return False
+        lastmod = self._lastmods.get(canonical_url(url))
+        if lastmod and record.lastmod:
+            return lastmod == record.lastmod
+        if record.etag or record.last_modified:
+            return self._not_modified(record)
+        return False
+
+    def reusable_evaluation(self, page: WebsitePage) -> Optional[PageEvaluation]:
+        """Returns the stored evaluation of a page, which wasn't rendered as it didn't change."""
+        if not page.not_modified:
+            return None
+        record = self.get(page.url)
+        if record is None:
+            return None
+        return record.evaluation
+
+    def update(self, page: WebsitePage, evaluation: PageEvaluation):
+        """Stores the current state of a page for the next run."""
+        key = canonical_url(page.url)
+        previous = self._records.get(key)
+        if page.not_modified and previous is not None:
+            record = previous
+        else:
+            record = PageRecord(
+                url=page.url,
+                etag=page.headers.get("etag"),
+                last_modified=page.headers.get("last-modified"),
+                links=sorted(page.links),
+                evaluation=_compact(evaluation),
+            )
+        record.lastmod = self._lastmods.get(key, record.lastmod)
+        with self._lock:
+            self._next_records[key] = record
+
+    def save(self):
+        """Writes the records of the current run, pages which vanished are dropped."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self._next_records, f)
+        tmp_path.replace(self.path)
+
+    def _load(self) -> Dict[str, PageRecord]:
+        if not self.path.is_file():
+            return {}
+        try:
+            with open(self.path, "rb") as f:
+                records = pickle.load(f)
+            logger.info(f"Loaded {len(records)} pages of the former run from {self.path}")
+            return records
+        except Exception as e:
+            logger.warning(f"Could not load recrawl cache '{self.path}': {e}")
+            return {}
+
+    def _not_modified(self, record: PageRecord) -> bool:
+        headers = {}
+        if record.etag:
+            headers["If-None-Match"] = record.etag
+        if record.last_modified:
+            headers["If-Modified-Since"] = record.last_modified
+        try:
+            with self._session.get(
+                record.url, headers=headers, stream=True, allow_redirects=False, timeout=REQUEST_TIMEOUT
+            ) as response:
+                return response.status_code == 304
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Conditional request failed for {record.url}: {e}")
+            return False
+
+
+def _compact(evaluation: PageEvaluation) -> PageEvaluation:
+    """Copies an evaluation with plain results, which unpickle without loaded checks."""
+    results = [
+        Result(title=result.title, description=result.description, result=result.result, status=result.status)
+        for result in evaluation.results
+    ]
+    compact = PageEvaluation(url=evaluation.url, title=evaluation.title, results=results)
+    compact.tags = list(evaluation.tags)
+    compact.screenshot = evaluation.screenshot
+    compact.thumbnail = evaluation.thumbnail
+    return compact
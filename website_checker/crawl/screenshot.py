@@ -0,0 +1,151 @@
+import importlib.util
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None  # optional, needed for WebP and thumbnails
+
+NONE = "none"
+FIRST = "first"
+SAMPLED = "sampled"
+ALL = "all"
+MODES = (NONE, FIRST, SAMPLED, ALL)
+
+PNG = "png"
+JPEG = "jpeg"
+WEBP = "webp"
+FORMATS = (PNG, JPEG, WEBP)
+
+ImageData = Union[bytes, "Future[bytes]"]
+
+
+@dataclass
+class ScreenshotPolicy:
+    """Decides which pages get a screenshot and how it is encoded.
+
+    Parameters
+    ----------
+    mode
+        ``"none"``, only the ``"first"`` page, every n-th page when ``"sampled"`` or ``"all"`` pages.
+    sample_every
+        Distance between sampled pages.
+    format
+        ``"png"``, ``"jpeg"`` or ``"webp"``, WebP requires Pillow.
+    quality
+        Quality of JPEG and WebP images, 0 - 100.
+    viewport
+        Size of the browser window, e.g. ``{"width": 1280, "height": 720}``.
+    clip
+        Area of the page to capture, e.g. ``{"x": 0, "y": 0, "width": 1280, "height": 720}``.
+    thumbnail_width
+        Adds a downscaled copy of this width, requires Pillow.
+    """
+
+    mode: str = FIRST
+    sample_every: int = 10
+    format: str = JPEG
+    quality: int = 80
+    viewport: Optional[Dict[str, int]] = None
+    clip: Optional[Dict[str, float]] = None
+    thumbnail_width: Optional[int] = None
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown screenshot mode: {self.mode}")
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown screenshot format: {self.format}")
+        if self.needs_pillow and not HAS_PILLOW:
+            raise ValueError("WebP screenshots and thumbnails require Pillow, install it with 'pip install pillow'")
+
+    @property
+    def needs_pillow(self) -> bool:
+        return self.format == WEBP or bool(self.thumbnail_width)
+
+
+class Screenshotter:
+    """Takes the screenshots of a crawl according to a policy.
+
+    The browser captures on the crawl thread, converting to WebP and creating
+    thumbnails happens in a background thread.
+    """
+
+    def __init__(self, policy: Optional[ScreenshotPolicy] = None, max_workers=1):
+        self.policy = policy or ScreenshotPolicy()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.policy.needs_pillow:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screenshot")
+
+    def wanted(self) -> bool:
+        """Decides whether the next page gets a screenshot."""
+        with self._lock:
+            index, self._count = self._count, self._count + 1
+        mode = self.policy.mode
+        if mode == ALL:
+            return True
+        if mode == FIRST:
+            return index == 0
+        if mode == SAMPLED:
+            return index % max(1, self.policy.sample_every) == 0
+        return False
+
+    def capture(self, page: "Page") -> Tuple[Optional[ImageData], Optional[ImageData]]:
+        """Returns the screenshot and thumbnail of a page, if it gets one."""
+        if not self.wanted():
+            return None, None
+        options = {"scale": "css"}  # keeps the image size independent of the device pixel ratio
+        if self.policy.clip:
+            options["clip"] = self.policy.clip
+        if self.policy.format == JPEG:
+            options.update(type=JPEG, quality=self.policy.quality)
+        data = page.screenshot(**options)
+        if self._executor is None:
+            return data, None
+
+        screenshot: ImageData = data
+        thumbnail = None
+        if self.policy.format == WEBP:
+            screenshot = self._executor.submit(self._encode, data)
+        if self.policy.thumbnail_width:
+            thumbnail = self._executor.submit(self._thumbnail, data)
+        return screenshot, thumbnail
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def _encode(self, data: bytes) -> bytes:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            return _save(image, self.policy.format, self.policy.quality)
+
+    def _thumbnail(self, data: bytes) -> bytes:
+        from PIL import Image
+
+        width = self.policy.thumbnail_width
+        with Image.open(io.BytesIO(data)) as image:
+            height = max(1, round(image.height * width / image.width))
+            thumbnail = image.resize((width, height))
+            return _save(thumbnail, self.policy.format, self.policy.quality)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _save(image, image_format: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == PNG:
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, format=image_format.upper(), quality=quality)
+    return buffer.getvalue()
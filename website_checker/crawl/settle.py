@@ -0,0 +1,153 @@
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Request
+
+NETWORK_IDLE = "networkidle"
+QUIET = "quiet"
+BUDGET = "budget"
+
+DEFAULT_BUDGET = 30000  # milliseconds, the navigation timeout of Playwright
+DEFAULT_QUIET_BUDGET = 10000  # milliseconds
+DEFAULT_QUIET_WINDOW = 500  # milliseconds
+DEFAULT_LONG_REQUEST = 5000  # milliseconds, pending longer is treated as long-polling
+POLL_INTERVAL = 50  # milliseconds
+
+LONG_LIVED_RESOURCE_TYPES = ("eventsource", "websocket", "media")
+LONG_LIVED_URL_PATTERNS = (
+    "google-analytics.com/",
+    "googletagmanager.com/",
+    "analytics.google.com/",
+    "doubleclick.net/",
+    "facebook.com/tr",
+    "hotjar.com/",
+    "/collect?",
+)
+
+
+@dataclass
+class SettleResult:
+    """How waiting for a page ended."""
+
+    strategy: str
+    reason: str  # networkidle, quiet or budget
+    duration: float  # milliseconds
+
+
+class NetworkIdleSettle:
+    """Waits until there are no network connections for 500 ms."""
+
+    name = NETWORK_IDLE
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+
+    def goto(self, page: "Page", url: str) -> SettleResult:
+        start = time.monotonic()
+        page.goto(url, wait_until="networkidle", timeout=self.budget)
+        return SettleResult(self.name, NETWORK_IDLE, _elapsed(start))
+
+
+class QuietWindowSettle:
+    """Waits for the DOM and a short window without relevant network traffic.
+
+    Analytics beacons, event streams, media and requests pending longer than
+    ``long_request`` don't keep the page busy. The wait ends after ``budget``
+    milliseconds at the latest, so pages which never settle don't stall the crawl.
+    """
+
+    name = QUIET
+
+    def __init__(
+        self,
+        quiet_window: int = DEFAULT_QUIET_WINDOW,
+        budget: int = DEFAULT_QUIET_BUDGET,
+        long_request: int = DEFAULT_LONG_REQUEST,
+        ignored_url_patterns: Iterable[str] = LONG_LIVED_URL_PATTERNS,
+    ):
+        self.quiet_window = quiet_window
+        self.budget = budget
+        self.long_request = long_request
+        self.ignored_url_patterns = tuple(ignored_url_patterns)
+
+    def goto(self, page: "Page", url: str) -> SettleResult:
+        start = time.monotonic()
+        tracker = _RequestTracker(self._is_long_lived, start)
+        page.on("request", tracker.started)
+        page.on("requestfinished", tracker.finished)
+        page.on("requestfailed", tracker.finished)
+        page.goto(url, wait_until="domcontentloaded", timeout=self.budget)
+
+        while True:
+            elapsed = _elapsed(start)
+            if elapsed >= self.budget:
+                return SettleResult(self.name, BUDGET, elapsed)
+            if tracker.quiet_since(self.long_request) >= self.quiet_window:
+                return SettleResult(self.name, QUIET, elapsed)
+            page.wait_for_timeout(min(POLL_INTERVAL, self.budget - elapsed))
+
+    def _is_long_lived(self, request: "Request") -> bool:
+        if request.resource_type in LONG_LIVED_RESOURCE_TYPES:
+            return True
+        return any(pattern in request.url for pattern in self.ignored_url_patterns)
+
+
+class _RequestTracker:
+    """Keeps track of the pending requests, which delay a settled page."""
+
+    def __init__(self, is_long_lived, start: float):
+        self._is_long_lived = is_long_lived
+        self._pending: Dict["Request", float] = {}
+        self._last_activity = start
+
+    def started(self, request: "Request"):
+        if not self._is_long_lived(request):
+            self._pending[request] = time.monotonic()
+            self._last_activity = time.monotonic()
+
+    def finished(self, request: "Request"):
+        if self._pending.pop(request, None) is not None:
+            self._last_activity = time.monotonic()
+
+    def quiet_since(self, long_request: float) -> float:
+        """Milliseconds without relevant traffic, 0 while a request is pending."""
+        now = time.monotonic()
+        for started in self._pending.values():
+            if (now - started) * 1000 < long_request:
+                return 0
+        return (now - self._last_activity) * 1000
+
+
+SETTLE_STRATEGIES = {
+    NETWORK_IDLE: NetworkIdleSettle,
+    QUIET: QuietWindowSettle,
+}
+
+
+def make_settle_strategy(name: str = NETWORK_IDLE, **kwargs):
+    """Creates a settle strategy by its name."""
+    if name not in SETTLE_STRATEGIES:
+        raise ValueError(f"Unknown settle strategy: {name}")
+    return SETTLE_STRATEGIES[name](**kwargs)
+
+
+def log_settle_times(results: List[Optional[SettleResult]]):
+    """Logs how long pages took to settle and what ended the wait."""
+    results = [result for result in results if result is not None]
+    if not results:
+        return
+    durations = sorted(result.duration for result in results)
+    p50 = durations[int(0.5 * (len(durations) - 1))]
+    p95 = durations[int(0.95 * (len(durations) - 1))]
+    reasons: Dict[str, int] = {}
+    for result in results:
+        reasons[result.reason] = reasons.get(result.reason, 0) + 1
+    logger.info(f"Pages settled in {p50:.0f} ms (p50), {p95:.0f} ms (p95), ended by {reasons}")
+
+
+def _elapsed(start: float) -> float:
+    return (time.monotonic() - start) * 1000
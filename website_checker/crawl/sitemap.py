@@ -0,0 +1,93 @@
+import gzip
+import io
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set
+from xml.etree import ElementTree
+
+import requests
+from loguru import logger
+
+REQUEST_TIMEOUT = 10  # seconds
+MAX_SITEMAPS = 1000  # protects against endless sitemap indexes
+GZIP_SIGNATURE = b"\x1f\x8b"
+ENTRY_TAGS = ("url", "sitemap")
+
+
+@dataclass
+class SitemapEntry:
+    url: str
+    lastmod: Optional[str] = None
+
+
+def find_sitemaps(domain: str, session: requests.Session) -> List[str]:
+    """Returns the sitemaps listed in robots.txt or the default sitemap location."""
+    sitemaps = []
+    try:
+        response = session.get(f"{domain}/robots.txt", timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            for line in response.text.splitlines():
+                key, _, value = line.partition(":")
+                if key.strip().lower() == "sitemap" and value.strip():
+                    sitemaps.append(value.strip())
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Could not load robots.txt of {domain}: {e}")
+    return sitemaps or [f"{domain}/sitemap.xml"]
+
+
+def iter_sitemap_urls(domain: str, session: Optional[requests.Session] = None) -> Iterator[SitemapEntry]:
+    """Yields all page urls of the sitemaps of a domain.
+
+    Sitemaps are parsed as a stream, gzipped sitemaps and nested sitemap indexes
+    are supported.
+    """
+    if session is None:
+        session = requests.Session()
+    pending = find_sitemaps(domain, session)
+    seen: Set[str] = set()
+    while pending and len(seen) < MAX_SITEMAPS:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        try:
+            for entry, is_sitemap in _parse_sitemap(sitemap_url, session):
+                if is_sitemap:
+                    pending.append(entry.url)
+                else:
+                    yield entry
+        except (requests.exceptions.RequestException, ElementTree.ParseError, OSError) as e:
+            logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+
+
+def _parse_sitemap(url: str, session: requests.Session):
+    """Yields entries of a sitemap and whether they link to another sitemap."""
+    with session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # undo a gzip transfer encoding
+        stream = io.BufferedReader(response.raw)
+        if stream.peek(2)[:2] == GZIP_SIGNATURE:
+            stream = gzip.GzipFile(fileobj=stream)
+
+        loc = lastmod = None
+        path: List[str] = []  # local names of the open elements
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            tag = _local_name(element.tag)
+            if event == "start":
+                path.append(tag)
+                continue
+            path.pop()
+            in_entry = bool(path) and path[-1] in ENTRY_TAGS  # not e.g. the loc of an image:image
+            if tag == "loc" and in_entry:
+                loc = (element.text or "").strip()
+            elif tag == "lastmod" and in_entry:
+                lastmod = (element.text or "").strip() or None
+            elif tag in ENTRY_TAGS:
+                if loc:
+                    yield SitemapEntry(url=loc, lastmod=lastmod), tag == "sitemap"
+                loc = lastmod = None
+                element.clear()  # keeps memory flat for big sitemaps
+
+
+def _local_name(tag: str) -> str:
+    """Removes the XML namespace of a tag."""
+    return tag.rsplit("}", 1)[-1]
@@ -1,7 +1,18 @@
+from concurrent.futures import Future
 from datetime import datetime
+from typing import Optional, Tuple
+
+from bs4 import BeautifulSoup
 
 from website_checker.crawl.cookie import Cookie
 
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # optional, parses several times faster
+    HTML_PARSER = "html.parser"
+
 
 class WebsitePage:
     def __init__(
@@ -14,6 +25,11 @@ class WebsitePage:
         requests=None,
         failed_requests=None,
         screenshot=None,
+        headers=None,
+        links=None,
+        not_modified=False,
+        settle=None,
+        thumbnail=None,
     ):
         if elements is None:
             elements = []
@@ -23,6 +39,10 @@ class WebsitePage:
             requests = []
         if failed_requests is None:
             failed_requests = []
+        if headers is None:
+            headers = {}
+        if links is None:
+            links = []
         self.url = url
         self.title = title
         self.html = html
@@ -31,10 +51,74 @@ class WebsitePage:
         self.requests = requests
         self.failed_requests = failed_requests
         self.created = datetime.now()
-        self.screenshot = screenshot
+        self._screenshot = screenshot  # bytes or a future, while encoding
+        self._thumbnail = thumbnail
+        self.headers = headers  # of the HTML document
+        self.links = links  # internal links on this page
+        self.not_modified = not_modified  # unchanged since a former run, not rendered
+        self.settle = settle  # how waiting for the page ended
+        self._soup: Optional[Tuple[str, BeautifulSoup]] = None  # parsed html
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Parsed HTML, which is shared by all checks and must not be changed.
+
+        The HTML is parsed on first access and again after it changed.
+        """
+        if self._soup is None or self._soup[0] is not self.html:
+            self._soup = (self.html, BeautifulSoup(self.html, HTML_PARSER))
+        return self._soup[1]
+
+    @property
+    def screenshot(self):
+        return _resolve(self._screenshot)
+
+    @screenshot.setter
+    def screenshot(self, value):
+        self._screenshot = value
+
+    @property
+    def thumbnail(self):
+        return _resolve(self._thumbnail)
+
+    @thumbnail.setter
+    def thumbnail(self, value):
+        self._thumbnail = value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_screenshot"] = self.screenshot
+        state["_thumbnail"] = self.thumbnail
+        state["_soup"] = None  # parsed again when needed
+        return state
+
+    def __setstate__(self, state):
+        if "screenshot" in state:  # pickled by an older version
+            state["_screenshot"] = state.pop("screenshot")
+        state.setdefault("_thumbnail", None)
+        state.setdefault("_soup", None)
+        self.__dict__.update(state)
+
+    def release(self):
+        """Drops the content of an analyzed page, url, title and links are kept."""
+        self.html = ""
+        self._soup = None
+        self.cookies = []
+        self.elements = []
+        self.requests = []
+        self.failed_requests = []
+        self._screenshot = None
+        self._thumbnail = None
 
     def add_cookie(self, cookie: Cookie):
         self.cookies.append(cookie)
 
     def add_element(self, element):
         self.elements.append(element)
+
+
+def _resolve(value):
+    """Waits for an image, which is encoded in the background."""
+    if isinstance(value, Future):
+        return value.result()
+    return value
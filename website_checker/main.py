@@ -1,13 +1,23 @@
+import functools
 import os
 import pickle
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, List, Protocol, Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from loguru import logger
 
 from website_checker import utils
+from website_checker.analyze.background import BackgroundAnalyzer
 from website_checker.analyze.result import PageEvaluation
 from website_checker.crawl.browser import Browser
+from website_checker.crawl.checkpoint import CrawlCheckpoint
 from website_checker.crawl.crawler import Crawler
+from website_checker.crawl.interception import InterceptionPolicy
+from website_checker.crawl.recrawl import RecrawlCache
+from website_checker.crawl.screenshot import ScreenshotPolicy
+from website_checker.crawl.settle import log_settle_times, make_settle_strategy
+from website_checker.crawl.sitemap import iter_sitemap_urls
 from website_checker.crawl.websitepage import WebsitePage
 from website_checker.report import report as report_util
 from website_checker.report.report_data import ReportData
@@ -32,53 +42,206 @@ def run_full_analysis(
     rate_limit=None,
     max_pages=None,
     save_crawled_pages=False,
+    concurrency=1,
+    state_dir=None,
+    resume=False,
+    seed_sitemaps=False,
+    recrawl_cache=None,
+    lean=None,
+    settle=None,
+    screenshots: Optional[ScreenshotPolicy] = None,
+    analyze_workers=1,
 ) -> Tuple[Path, List[PageEvaluation], List[WebsitePage]]:
+    """Crawls, analyzes and reports a website.
+
+    Each page is analyzed as soon as it is crawled and its content is released
+    afterwards, so memory doesn't grow with the page content of the website.
+    With ``analyze_workers``, pages are analyzed in background threads while the
+    next pages load. Crawled pages are only returned and saved with ``save_crawled_pages``.
+    The report is rendered by the browser of the crawl.
+    """
     creation_datetime = _make_creation_datetime()
     domainname = utils.get_domain_as_text(url)
     max_pages_option = f"{max_pages}p" if max_pages else "full"
+    recrawl = RecrawlCache(recrawl_cache) if recrawl_cache else None
+    browser = _make_browser(rate_limit, settle, screenshots)
+
+    with browser:  # started once for the crawl and the report
+        pages = iter_crawl(
+            url,
+            rate_limit=rate_limit,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            state_dir=state_dir,
+            resume=resume,
+            seed_sitemaps=seed_sitemaps,
+            recrawl=recrawl,
+            lean=lean,
+            settle=settle,
+            screenshots=screenshots,
+            browser=browser,
+        )
+        crawled_pages = []
+        evaluation_result = []
+        for page, eval_result in iter_evaluate(analyzer, pages, recrawl=recrawl, workers=analyze_workers):
+            evaluation_result.append(eval_result)
+            if save_crawled_pages:
+                crawled_pages.append(page)
+            else:
+                page.release()
+        if save_crawled_pages:
+            save_pages(crawled_pages)
+        if recrawl:
+            recrawl.save()
+
+        report_filename = "_".join(["Report", max_pages_option, domainname, f"{creation_datetime}.pdf"])
+        pdf_path = report(report_filename, evaluation_result, converter, browser=browser)
+    return pdf_path, evaluation_result, crawled_pages
+
+
+def crawl(
+    url,
+    rate_limit=False,
+    max_pages=False,
+    save_data=False,
+    concurrency=1,
+    state_dir=None,
+    resume=False,
+    seed_sitemaps=False,
+    recrawl=None,
+    lean=None,
+    settle=None,
+    screenshots: Optional[ScreenshotPolicy] = None,
+) -> List[WebsitePage]:
+    pages = list(
+        iter_crawl(
+            url,
+            rate_limit=rate_limit,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            state_dir=state_dir,
+            resume=resume,
+            seed_sitemaps=seed_sitemaps,
+            recrawl=recrawl,
+            lean=lean,
+            settle=settle,
+            screenshots=screenshots,
+        )
+    )
+    if save_data:
+        save_pages(pages)
+    return pages
 
-    crawled_pages = crawl(
-        url,
+
+def iter_crawl(
+    url,
+    rate_limit=False,
+    max_pages=False,
+    concurrency=1,
+    state_dir=None,
+    resume=False,
+    seed_sitemaps=False,
+    recrawl=None,
+    lean=None,
+    settle=None,
+    screenshots: Optional[ScreenshotPolicy] = None,
+    browser: Optional[Browser] = None,
+) -> Iterator[WebsitePage]:
+    """Yields crawled pages one by one, pages of a resumed crawl first.
+
+    A given browser is used instead of a new one with the settings of the crawl.
+    """
+    checkpoint = None
+    settle_times = []
+    try:
+        count = 0
+        if state_dir:
+            checkpoint = CrawlCheckpoint(state_dir)
+            checkpoint.start(url, resume=resume)
+            restored_pages = checkpoint.load_pages()
+            if restored_pages:
+                logger.info(f"Restored {len(restored_pages)} crawled pages from {state_dir}")
+            for page in restored_pages[:max_pages] if max_pages else restored_pages:
+                count += 1
+                yield page
+
+        if not max_pages or count < max_pages:
+            if browser is None:
+                browser = _make_browser(rate_limit, settle, screenshots)
+            crawler = Crawler(
+                browser,
+                url,
+                concurrency=concurrency,
+                checkpoint=checkpoint,
+                recrawl=recrawl,
+                interception=InterceptionPolicy(action=lean) if lean else None,
+                screenshots=screenshots,
+            )
+            if seed_sitemaps:
+                entries = list(iter_sitemap_urls(crawler.domain))
+                if recrawl:
+                    recrawl.set_lastmods(entries)
+                crawler.seed(entry.url for entry in entries)
+            with crawler:
+                for idx, page in enumerate(crawler, start=count + 1):
+                    settle_times.append(page.settle)
+                    yield page
+                    if max_pages and idx >= max_pages:
+                        break
+    finally:
+        if checkpoint:
+            checkpoint.close()
+    log_settle_times(settle_times)
+
+
+def _make_browser(rate_limit=None, settle=None, screenshots: Optional[ScreenshotPolicy] = None) -> Browser:
+    return Browser(
         rate_limit=rate_limit,
-        max_pages=max_pages,
-        save_data=save_crawled_pages,
+        settle=make_settle_strategy(settle) if settle else None,
+        viewport=screenshots.viewport if screenshots else None,
     )
 
-    evaluation_result = evaluate(analyzer, crawled_pages)
 
-    report_filename = "_".join(["Report", max_pages_option, domainname, f"{creation_datetime}.pdf"])
-    pdf_path = report(report_filename, evaluation_result, converter)
-    return pdf_path, evaluation_result, crawled_pages
+def save_pages(pages: List[WebsitePage]):
+    pickle.dump(pages, open(utils.get_desktop_path() / "pages.p", "wb"))
 
 
-def crawl(url, rate_limit=False, max_pages=False, save_data=False) -> List[WebsitePage]:
-    pages = []
-    browser = Browser(rate_limit=rate_limit)
-    with Crawler(browser, url) as crawler:
-        for idx, page in enumerate(crawler, start=1):
-            pages.append(page)
-            if max_pages and idx >= max_pages:
-                break
-    if save_data:
-        pickle.dump(pages, open(utils.get_desktop_path() / "pages.p", "wb"))
-    return pages
+def evaluate(analyzer: SupportsRunChecks, pages: Iterable[WebsitePage], recrawl=None) -> List[PageEvaluation]:
+    return [eval_result for _, eval_result in iter_evaluate(analyzer, pages, recrawl=recrawl)]
+
+
+def iter_evaluate(
+    analyzer: SupportsRunChecks, pages: Iterable[WebsitePage], recrawl=None, workers=0
+) -> Iterator[Tuple[WebsitePage, PageEvaluation]]:
+    """Yields each page with its evaluation as soon as it is analyzed.
+
+    Without workers, a page is analyzed before the next page is crawled.
+    """
+    evaluate_page = functools.partial(_evaluate_page, analyzer, recrawl=recrawl)
+    if not workers:
+        for page in pages:
+            yield page, evaluate_page(page)
+        return
+    with BackgroundAnalyzer(evaluate_page, workers=workers) as background:
+        yield from background.map(pages)
 
 
-def evaluate(analyzer: SupportsRunChecks, pages: List[WebsitePage]) -> List[PageEvaluation]:
-    evaluated_data = []
-    for page in pages:
+def _evaluate_page(analyzer: SupportsRunChecks, page: WebsitePage, recrawl=None) -> PageEvaluation:
+    eval_result = recrawl.reusable_evaluation(page) if recrawl else None
+    if eval_result is None:
         eval_result = analyzer.run_checks(page)
-        evaluated_data.append(eval_result)
-    return evaluated_data
+    if recrawl:
+        recrawl.update(page, eval_result)
+    return eval_result
 
 
-def report(filename, evaluated_pages: List[PageEvaluation], converter: Callable):
+def report(filename, evaluated_pages: List[PageEvaluation], converter: Callable, browser: Optional[Browser] = None):
     pdf_path = utils.get_desktop_path() / filename
     if DEBUG:
         pdf_path = DEFAULT_PDF_OUTPUT
 
     context = converter(evaluated_pages)
-    return report_util.PDFReport().render(context, pdf_path)
+    return report_util.PDFReport(browser=browser).render(context, pdf_path)
 
 
 def _make_creation_datetime():
@@ -1,7 +1,8 @@
 import os
-import tempfile
 from pathlib import Path
+from typing import Optional
 
+from website_checker.crawl.browser import Browser
 from website_checker.report import utilities
 from website_checker.report.report_data import ReportData
 
@@ -32,10 +33,13 @@ class HTMLReport(ReportTemplate):
         return html_path
 
 
-class PDFReport(HTMLReport):
+class PDFReport(ReportTemplate):
+    def __init__(self, html_template=DEFAULT_TEMPLATE, browser: Optional[Browser] = None):
+        super().__init__(html_template)
+        self.browser = browser  # renders the PDF, a new one is launched if not given
+
     def render(self, data: ReportData, path: Path) -> Path:
         """Builds a PDF report from the given data."""
-        with tempfile.NamedTemporaryFile() as tmp_file:
-            html = super().render(data, Path(tmp_file.name))
-            utilities.html_to_pdf(html, path)
+        html = utilities.build_html(self.html_template, data, DEFAULT_HTML_OUTPUT if DEBUG else None)
+        utilities.html_to_pdf(html, path, browser=self.browser)
         return path
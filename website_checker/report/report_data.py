@@ -1,10 +1,12 @@
-import copy
-from dataclasses import asdict, dataclass, field
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from website_checker.analyze.result_data import StatusSummary, TestDescription
 
+DATE_FORMAT = "%d.%m.%Y %H:%M"
+
 
 @dataclass
 class ReportData:
@@ -16,10 +18,39 @@ class ReportData:
     pages: List[Any] = field(default_factory=list)
     descriptions: List[TestDescription] = field(default_factory=list)
     screenshot: Optional[str] = None
+    screenshot_type: str = "image/png"
+    thumbnails: Dict[str, str] = field(default_factory=dict)  # data uris by page url
     tags: Optional[List[str]] = None
     creation_date: datetime = field(default_factory=lambda: datetime.now())
 
-    def to_dict(self) -> Dict[str, Any]:
-        cp: Any = copy.deepcopy(self)
-        cp.creation_date = self.creation_date.strftime("%d.%m.%Y %H:%M")
-        return {k: v for k, v in asdict(cp).items() if v}
+    def to_dict(self) -> "ReportContext":
+        """Returns the fields for a template, without copying them."""
+        return ReportContext(self)
+
+
+class ReportContext(Mapping):
+    """Read-only view of the set fields of report data.
+
+    Values are the objects of the report data, which templates read by
+    attribute. The creation date is formatted when it is read.
+    """
+
+    def __init__(self, data: ReportData):
+        self._data = data
+        self._names = [f.name for f in fields(data)]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._names:
+            raise KeyError(key)
+        value = getattr(self._data, key)
+        if not value:
+            raise KeyError(key)
+        if key == "creation_date":
+            return value.strftime(DATE_FORMAT)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self._names if getattr(self._data, name))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
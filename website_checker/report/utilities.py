@@ -1,16 +1,28 @@
-import contextlib
-import shutil
-import tempfile
+import functools
+import os
 from pathlib import Path
-from typing import Protocol, Union
+from typing import Any, Mapping, Optional, Protocol, Union
 
-from jinja2 import Environment, FileSystemLoader
-from playwright.async_api import PdfMargins
-from playwright.sync_api import sync_playwright
+from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+)
+from loguru import logger
+from playwright.sync_api import PdfMargins
+
+from website_checker.crawl.browser import Browser
+
+DEBUG = False
+if os.environ.get("DEBUG"):
+    DEBUG = True
 
 
 class SupportsToDict(Protocol):
-    def to_dict(self) -> dict:
+    def to_dict(self) -> Mapping[str, Any]:
         ...
 
 
@@ -34,8 +46,7 @@ def build_html(html_template: Union[str, Path], context: SupportsToDict, path: U
     template_dir = html_template.parent
     template_name = html_template.name
 
-    environment = Environment(loader=FileSystemLoader(template_dir))
-    template = environment.get_template(template_name)
+    template = get_environment(template_dir).get_template(template_name)
     html_string = template.render(context.to_dict())
 
     if path:
@@ -44,32 +55,55 @@ def build_html(html_template: Union[str, Path], context: SupportsToDict, path: U
     return html_string
 
 
-def _text_to_file(text: Union[bytes, str]) -> Path:
-    """Returns a temporary file with given content."""
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-    if type(text) is str:
-        text = bytes(text, encoding="utf-8")
-    assert type(text) is bytes
-    tmp_file.write(text)
-    tmp_file.seek(0)
-    # TODO close file
-    return Path(tmp_file.name)
-
-
-@contextlib.contextmanager
-def ensure_html_extension_ctx(path: Path):
-    """Ensures that the path is an .html file."""
-    if path.suffix == ".html":
-        yield path
-    else:
-        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        tmp_path = Path(tmp_file.name)
-        shutil.copy(path, tmp_path)
-        yield tmp_path
-        tmp_file.close()
-
-
-def html_to_pdf(html: Union[bytes, str, Path], path: Union[None, str, Path] = None) -> bytes:
+@functools.lru_cache(maxsize=None)
+def get_environment(template_dir: Path, compiled_dir: Optional[Path] = None) -> Environment:
+    """Returns the Jinja environment of a template directory, which is shared by all reports of a process.
+
+    Templates are compiled once per process and their bytecode is cached on
+    disk for other processes. Only in debug mode, changed template files are
+    reloaded.
+
+    Parameters
+    ----------
+    template_dir
+        The directory of the templates.
+    compiled_dir
+        Templates precompiled by ``compile_templates``, which are preferred to the template files.
+    """
+    loader: BaseLoader = FileSystemLoader(template_dir)
+    if compiled_dir:
+        loader = ChoiceLoader([ModuleLoader(str(compiled_dir)), loader])
+    try:
+        bytecode_cache = FileSystemBytecodeCache()
+    except RuntimeError as e:  # no writable cache directory
+        logger.debug(f"Template bytecode is not cached: {e}")
+        bytecode_cache = None
+    return Environment(loader=loader, bytecode_cache=bytecode_cache, auto_reload=DEBUG)
+
+
+def compile_templates(template_dir: Union[str, Path], target: Union[str, Path]) -> Path:
+    """Compiles all templates of a directory to Python modules, e.g. to ship them with a package."""
+    environment = Environment(loader=FileSystemLoader(template_dir))
+    environment.compile_templates(str(target), zip=None)
+    return Path(target)
+
+
+def _read_html(html: Union[bytes, str, Path]) -> str:
+    """Returns the HTML source of HTML bytes, a string or a file."""
+    if type(html) is bytes:
+        return html.decode("utf-8")
+    if type(html) is str:
+        if "<" not in html and Path(html).is_file():  # HTML source is no valid file name
+            return Path(html).read_text(encoding="utf-8")
+        return html
+    if isinstance(html, Path):
+        return html.read_text(encoding="utf-8")
+    raise TypeError(f"Unsupported type: {type(html)}")
+
+
+def html_to_pdf(
+    html: Union[bytes, str, Path], path: Union[None, str, Path] = None, browser: Optional[Browser] = None
+) -> bytes:
     """Converts HTML to PDF.
 
     Parameters
@@ -78,33 +112,16 @@ def html_to_pdf(html: Union[bytes, str, Path], path: Union[None, str, Path] = No
         The HTML bytes or file to convert.
     path
         The path to save the PDF file to. If not given, the PDF is not written to a file.
+    browser
+        A started browser to render with, e.g. the one of the crawl. If not given, a browser is launched.
 
     Returns
     -------
     The PDF file as bytes.
     """
-    if type(html) is bytes:
-        html = _text_to_file(html)
-    elif type(html) is str:
-        if Path(html).is_file():
-            html = Path(html)
-        else:
-            html = _text_to_file(html)
-    elif not isinstance(html, Path):
-        raise TypeError(f"Unsupported type: {type(html)}")
-
-    assert html.is_file()
-
-    with sync_playwright() as pw:
-        try:
-            browser = pw.chromium.launch(headless=True)
-            page = browser.new_page()
-            with ensure_html_extension_ctx(html) as tmp_html_file:
-                assert tmp_html_file.suffix == ".html"  # Playwright requires .html for rendering
-                html_url = f"file://{str(tmp_html_file)}"
-                page.goto(html_url)
-                margin: PdfMargins = {"top": "2cm", "bottom": "2cm", "left": "2cm", "right": "2cm"}
-                pdf_bytes = page.pdf(path=path, format="A4", margin=margin)
-            return pdf_bytes
-        finally:
-            browser.close()
+    html = _read_html(html)
+    margin: PdfMargins = {"top": "2cm", "bottom": "2cm", "left": "2cm", "right": "2cm"}
+    if browser is None:
+        browser = Browser()
+    with browser:
+        return browser.pdf(html, path=path, format="A4", margin=margin)
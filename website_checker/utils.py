@@ -1,7 +1,10 @@
 import re
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Iterable, Iterator
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
 
 
 def get_domain_as_text(url):
@@ -14,7 +17,82 @@ def datetime_str(current_datetime=datetime.now()):
     return current_datetime.strftime("%Y-%m-%d %H%M")
 
 
+def image_mime_type(data: bytes) -> str:
+    """Returns the mime type of PNG, JPEG and WebP images.
+
+    Examples
+    --------
+    >>> image_mime_type(b"\\xff\\xd8\\xff\\xe0")
+    'image/jpeg'
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
 def get_desktop_path():
     home_dir = Path.home()
     desktop_path = home_dir / "Desktop"
     return desktop_path
+
+
+def canonical_url(url: str, sort_query: bool = False) -> str:
+    """Returns a canonical form of a url to compare urls with each other.
+
+    Scheme and host are lowercased, default ports, the fragment and trailing
+    slashes are removed. Query parameters are sorted on request. An invalid
+    port is kept as it is.
+
+    Examples
+    --------
+    >>> canonical_url("HTTPS://www.Domain.com:443/path/#section")
+    'https://www.domain.com/path'
+    >>> canonical_url("https://www.domain.com/?b=2&a=1", sort_query=True)
+    'https://www.domain.com?a=1&b=2'
+    >>> canonical_url("http://localhost:PORT/x/")
+    'http://localhost:port/x'
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    try:
+        port = parts.port
+    except ValueError:  # not numeric or out of range
+        port = None
+    if port is not None and DEFAULT_PORTS.get(scheme) == port:
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parts.path.rstrip("/")
+    query = parts.query
+    if sort_query and query:
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class UrlIndex:
+    """Set of urls, which are stored by their canonical form.
+
+    Urls are normalized once on insert, so membership tests are constant in time.
+    """
+
+    def __init__(self, urls: Iterable[str] = (), sort_query: bool = False):
+        self.sort_query = sort_query
+        self._urls = set()
+        for url in urls:
+            self.add(url)
+
+    def canonical(self, url: str) -> str:
+        return canonical_url(url, sort_query=self.sort_query)
+
+    def add(self, url: str):
+        self._urls.add(self.canonical(url))
+
+    def __contains__(self, url) -> bool:
+        return isinstance(url, str) and self.canonical(url) in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._urls)